@@ -83,6 +83,21 @@ config = {
                 }
             },
 
+            # Share one ORM model instance per entity and primary key for all queries
+            # of a request.  Saves memory and CPU on pages with many ORM queries.
+            # 'IdentityMap': {
+            #     'module': 'uvicore.http.middleware.IdentityMap',
+            # },
+
+            # Pin one pooled database connection per request, reused by all of its queries.
+            # Add 'transaction': True to run each request in one transaction.
+            # 'DatabaseConnection': {
+            #     'module': 'uvicore.http.middleware.DatabaseConnection',
+            #     'options': {
+            #         'connections': ['app1'],
+            #     }
+            # },
+
             # If you have a loadbalancer with SSL termination in front of your web
             # app, don't use this redirection to enforce HTTPS as it is always HTTP internally.
             # 'HTTPSRedirect': {
@@ -0,0 +1,30 @@
+import pytest
+import uvicore
+import sqlalchemy as sa
+from uvicore.support.dumper import dump
+
+# DB Builder
+
+@pytest.mark.asyncio
+async def test_count(app1):
+    assert 7 == await uvicore.db.query('app1').table('posts').count()
+    assert 3 == await uvicore.db.query('app1').table('posts').where('creator_id', 2).count()
+
+    # Limit and offset do not apply to counts
+    assert 3 == await uvicore.db.query('app1').table('posts').where('creator_id', 2).limit(1).count()
+
+
+@pytest.mark.asyncio
+async def test_exists(app1):
+    assert True == await uvicore.db.query('app1').table('posts').where('creator_id', 2).exists()
+    assert False == await uvicore.db.query('app1').table('posts').where('creator_id', 999).exists()
+
+
+@pytest.mark.asyncio
+async def test_aggregate(app1):
+    results = await uvicore.db.query('app1').table('posts').where('creator_id', 2).aggregate(
+        total=('count', 'id'),
+        first=('min', 'id'),
+        last=('max', 'id'),
+    )
+    assert {'total': 3, 'first': 3, 'last': 5} == results
@@ -32,3 +32,17 @@ async def test_multi(app1):
 
     # Delete temp post
     await uvicore.db.query().table('posts').where('id', post.id).delete()
+
+
+@pytest.mark.asyncio
+async def test_same_shape_twice(app1):
+    # The same update shape runs again with its own values
+    original = await uvicore.db.query().table('posts').where('id', 'in', [1, 2]).order_by('id').get()
+    await uvicore.db.query().table('posts').where('id', 1).update(other='other1 changed')
+    await uvicore.db.query().table('posts').where('id', 2).update(other='other2 changed')
+    posts = await uvicore.db.query().table('posts').where('id', 'in', [1, 2]).order_by('id').get()
+    assert ['other1 changed', 'other2 changed'] == [x.other for x in posts]
+
+    # Put them back
+    for post in original:
+        await uvicore.db.query().table('posts').where('id', post.id).update(other=post.other)
@@ -0,0 +1,80 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump, dd
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidation(app1):
+    from app1.models.post import Post
+
+    # Cached until a table the query reads is written
+    posts = await Post.query().include('creator').order_by('id').cache('test_cache_invalidation').get()
+    assert posts[0].title == 'Test Post1'
+
+    post = await Post.query().find(1)
+    post.title = 'Test Post1 Changed'
+    await post.save()
+
+    posts = await Post.query().include('creator').order_by('id').cache('test_cache_invalidation').get()
+    assert posts[0].title == 'Test Post1 Changed'
+
+    # Put it back
+    post.title = 'Test Post1'
+    await post.save()
+
+
+@pytest.mark.asyncio
+async def test_cache_builder_invalidation(app1):
+    from uvicore.database import tags
+    from app1.models.post import Post
+
+    # Query builder updates bump the version of the written table only
+    metakey = uvicore.db.metakey('app1')
+    before = await tags.versions(metakey, ['posts', 'comments'])
+    await uvicore.db.query('app1').table('posts').where('id', 1).update(title='Test Post1')
+    await Post.query().where('id', 1).update(title='Test Post1')
+    after = await tags.versions(metakey, ['posts', 'comments'])
+    assert after['posts'] == before['posts'] + 2
+    assert after['comments'] == before['comments']
+
+    # Relation tables are tagged too
+    query = Post.query().include('comments', 'tags')
+    tables = query._cache_tables(query.query)
+    assert 'posts' in tables and 'comments' in tables and 'tags' in tables and 'post_tags' in tables
+
+
+@pytest.mark.asyncio
+async def test_cache_single_flight(app1):
+    import asyncio
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    # Concurrent callers of a missing key share one callback
+    await uvicore.cache.forget('test_single_flight')
+    values = await asyncio.gather(*[uvicore.cache.remember('test_single_flight', compute) for x in range(10)])
+    assert ['value'] * 10 == values
+    assert 1 == len(calls)
+
+
+@pytest.mark.asyncio
+async def test_cache_stale(app1):
+    import asyncio
+    from uvicore.cache.flight import stale_entry
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return 'new'
+
+    # Expired entry inside the stale window is served while one task refreshes it
+    entry = stale_entry('old', 10)
+    entry['fresh'] = 0
+    await uvicore.cache.put('test_stale', entry, seconds=60)
+    assert 'old' == await uvicore.cache.remember('test_stale', compute, seconds=10, stale=60)
+    await asyncio.sleep(0.01)
+    assert 'new' == await uvicore.cache.remember('test_stale', compute, seconds=10, stale=60)
+    assert 1 == len(calls)
@@ -0,0 +1,32 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_count(app1):
+    from app1.models.post import Post
+
+    assert 7 == await Post.query().count()
+    assert 3 == await Post.query().where('creator_id', 2).count()
+
+    # Where on a *One relation
+    assert 2 == await Post.query().include('creator').where('creator.email', 'anonymous@example.com').count()
+
+
+@pytest.mark.asyncio
+async def test_exists(app1):
+    from app1.models.post import Post
+
+    assert True == await Post.query().where('id', 1).exists()
+    assert False == await Post.query().where('id', 999).exists()
+
+
+@pytest.mark.asyncio
+async def test_aggregate(app1):
+    from app1.models.post import Post
+
+    results = await Post.query().where('creator_id', 1).aggregate(first=('min', 'id'), last=('max', 'id'))
+    assert {'first': 1, 'last': 2} == results
@@ -0,0 +1,47 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_trusted(app1):
+    from app1.models.post import Post
+
+    # Trusted models skip validation but hold the same data
+    posts = await Post.query().include('creator', 'comments').order_by('id').get()
+    trusted = await Post.query().include('creator', 'comments').order_by('id').trusted().get()
+    assert [x.id for x in posts] == [x.id for x in trusted]
+    assert [x.title for x in posts] == [x.title for x in trusted]
+    assert posts[0].creator.email == trusted[0].creator.email
+    assert [x.title for x in posts[0].comments] == [x.title for x in trusted[0].comments]
+
+    # Callbacks still run
+    assert posts[0].cb == trusted[0].cb
+
+
+@pytest.mark.asyncio
+async def test_hydrator_compiled_once(app1):
+    from app1.models.post import Post
+    from uvicore.orm.hydrator import hydrator
+
+    row = {'id': 1, 'unique_slug': 'test-post1', 'title': 'Test Post1', 'body': 'body', 'creator_id': 1, 'owner_id': 1}
+    assert hydrator(Post, row) is hydrator(Post, dict(row))
+
+    post = hydrator(Post, row)(row)
+    assert 'test-post1' == post.slug
+    assert 1 == post.creator_id
+
+
+@pytest.mark.asyncio
+async def test_offload(app1):
+    from app1.models.post import Post
+
+    # Models built in a worker thread hold the same data
+    posts = await Post.query().include('creator', 'comments', 'tags').order_by('id').get()
+    offloaded = await Post.query().include('creator', 'comments', 'tags').order_by('id').offload().get()
+    assert [x.id for x in posts] == [x.id for x in offloaded]
+    assert posts[0].creator.email == offloaded[0].creator.email
+    assert [x.title for x in posts[0].comments] == [x.title for x in offloaded[0].comments]
+    assert [x.name for x in posts[0].tags] == [x.name for x in offloaded[0].tags]
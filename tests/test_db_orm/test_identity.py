@@ -0,0 +1,57 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump, dd
+
+
+@pytest.mark.asyncio
+async def test_identity_scope(app1):
+    from uvicore.orm import identity_scope
+    from uvicore.auth.models.user import User
+    from app1.models.post import Post
+
+    with identity_scope():
+        # Same row loaded by two plain queries is one instance
+        post = await Post.query().find(1)
+        assert post is await Post.query().find(1)
+        user = await User.query().find(post.creator_id)
+        assert user is (await User.query().where('id', post.creator_id).get())[0]
+
+        # Partial models are never shared
+        partial = await Post.query().select('id').find(1)
+        assert partial is not post
+
+        # Queries with includes get their own models
+        included = await Post.query().include('creator').find(1)
+        assert included is not post
+        assert included.creator is not user
+
+
+@pytest.mark.asyncio
+async def test_identity_relations_isolated(app1):
+    from uvicore.orm import identity_scope
+    from app1.models.post import Post
+
+    with identity_scope():
+        # Filtered relations of one query are not overwritten by a later query
+        filtered = await Post.query().include('comments').filter('comments.title', 'Post1 Comment1').find(1)
+        full = await Post.query().include('comments').find(1)
+        assert ['Post1 Comment1'] == [x.title for x in filtered.comments]
+        assert ['Post1 Comment1', 'Post1 Comment2'] == [x.title for x in full.comments]
+
+        # A plain query never returns relations set by an include query
+        plain = await Post.query().find(1)
+        assert plain.comments is None
+
+        # Saving forgets the instance, the next plain query loads a fresh one
+        await full.save()
+        assert full is not await Post.query().find(1)
+
+
+@pytest.mark.asyncio
+async def test_identity_no_scope(app1):
+    from app1.models.post import Post
+
+    # Without an identity map each query hydrates its own models
+    post = await Post.query().find(1)
+    assert post is not await Post.query().find(1)
+    assert post.id == 1
@@ -0,0 +1,107 @@
+import pytest
+import uvicore
+import sqlalchemy as sa
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_insert_with_relations_batch(app1):
+    from app1.models.post import Post, Tag
+
+    tags = await Tag.query().key_by('name').get()
+    pks = await Post.insert_with_relations([
+        {
+            'slug': 'test-batch1',
+            'title': 'Test Batch1',
+            'body': 'Batch1 body',
+            'creator_id': 1,
+            'owner_id': 2,
+            'comments': [
+                {'title': 'Batch1 Comment1', 'body': 'Batch1 comment1 body', 'creator_id': 1},
+                {'title': 'Batch1 Comment2', 'body': 'Batch1 comment2 body', 'creator_id': 1},
+            ],
+            'tags': [tags['linux'], tags['bsd']],
+        },
+        {
+            'slug': 'test-batch2',
+            'title': 'Test Batch2',
+            'body': 'Batch2 body',
+            'creator_id': 1,
+            'owner_id': 2,
+            'comments': [
+                {'title': 'Batch2 Comment1', 'body': 'Batch2 comment1 body', 'creator_id': 1},
+            ],
+            'tags': [tags['linux']],
+        },
+    ], batch=True)
+
+    # Each new PK is returned in order and children are linked to the right parent
+    assert 2 == len(pks)
+    posts = await Post.query().include('comments', 'tags').where('id', 'in', pks).order_by('id').get()
+    assert ['test-batch1', 'test-batch2'] == [x.slug for x in posts]
+    assert ['Batch1 Comment1', 'Batch1 Comment2'] == [x.title for x in posts[0].comments]
+    assert ['Batch2 Comment1'] == [x.title for x in posts[1].comments]
+    assert ['bsd', 'linux'] == sorted([x.name for x in posts[0].tags])
+    assert ['linux'] == [x.name for x in posts[1].tags]
+
+    # Delete temp comments, tag links and posts
+    await uvicore.db.query().table('comments').where('post_id', 'in', pks).delete()
+    await uvicore.db.query().table('post_tags').where('post_id', 'in', pks).delete()
+    await uvicore.db.query().table('posts').where('id', 'in', pks).delete()
+
+
+@pytest.mark.asyncio
+async def test_insert_with_relations_batch_keys(app1):
+    from app1.models.post import Post
+    from app1.models.comment import Comment
+
+    slugs = ['test-batch-keys' + str(i) for i in range(1, 6)]
+    pks = await Post.insert_with_relations([
+        {
+            'slug': slug,
+            'title': slug,
+            'body': slug,
+            'creator_id': 1,
+            'owner_id': 2,
+            'comments': [
+                {'title': slug, 'body': slug, 'creator_id': 1},
+                {'title': slug, 'body': slug, 'creator_id': 1},
+            ],
+        } for slug in slugs
+    ], batch=True)
+
+    # Each returned PK belongs to the record at the same position
+    posts = await Post.query().where('id', 'in', pks).key_by('id').get()
+    assert slugs == [posts[pk].slug for pk in pks]
+
+    # Each child points to the parent it was given with
+    comments = await Comment.query().where('post_id', 'in', pks).get()
+    assert 10 == len(comments)
+    for comment in comments:
+        assert comment.title == posts[comment.post_id].slug
+
+    # Delete temp comments and posts
+    await uvicore.db.query().table('comments').where('post_id', 'in', pks).delete()
+    await uvicore.db.query().table('posts').where('id', 'in', pks).delete()
+
+
+@pytest.mark.asyncio
+async def test_insert_many_events(app1):
+    from app1.models.tag import Tag
+
+    # Batch events carry every model of the bulk insert and fire once
+    fired = []
+    def handle(event):
+        fired.append((event.name, [x.name for x in event.models]))
+    uvicore.events.listen('uvicore.orm-{app1.models.tag.Tag}-AfterInsertMany', handle)
+
+    await Tag.insert([
+        {'name': 'many1', 'creator_id': 1},
+        {'name': 'many2', 'creator_id': 1},
+    ])
+    assert [('uvicore.orm-{app1.models.tag.Tag}-AfterInsertMany', ['many1', 'many2'])] == fired
+
+    # Delete temp tags
+    await uvicore.db.query().table('tags').where('name', 'in', ['many1', 'many2']).delete()
@@ -0,0 +1,43 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_after(app1):
+    from app1.models.post import Post
+
+    # 7 posts in pages of 3
+    pages = []
+    cursor = None
+    while True:
+        query = Post.query().include('comments').after(cursor).limit(3)
+        posts = await query.get()
+        pages.append([x.id for x in posts])
+        cursor = query.next_cursor
+        if not cursor: break
+    assert [[1, 2, 3], [4, 5, 6], [7]] == pages
+
+    # Each page loads its comments by selectin without changing the builder's own selectin
+    post = (await Post.query().include('comments').after().limit(1).get())[0]
+    assert ['Post1 Comment1', 'Post1 Comment2'] == [x.title for x in post.comments]
+    assert not Post.query().after().query.selectin
+
+
+@pytest.mark.asyncio
+async def test_after_desc(app1):
+    from app1.models.post import Post
+
+    query = Post.query().order_by('creator_id', 'DESC').after().limit(2)
+    first = await query.get()
+    assert query.next_cursor is not None
+
+    query = Post.query().order_by('creator_id', 'DESC').after(query.next_cursor).limit(10)
+    rest = await query.get()
+    assert query.next_cursor is None
+
+    # Pages do not overlap and keep the full sort order
+    posts = await Post.query().order_by([('creator_id', 'DESC'), ('id', 'ASC')]).get()
+    assert [x.id for x in posts] == [x.id for x in first] + [x.id for x in rest]
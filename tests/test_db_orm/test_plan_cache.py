@@ -0,0 +1,43 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_same_shape_rebinds_values(app1):
+    from app1.models.post import Post
+    from uvicore.database.builder import plans
+
+    # Same query shape with different values uses one plan
+    plans.clear()
+    posts = await Post.query().include('comments').where('creator_id', 2).get()
+    assert [3, 4, 5] == [x.id for x in posts]
+    assert 1 == len(plans.plans)
+
+    posts = await Post.query().include('comments').where('creator_id', 1).get()
+    assert [1, 2] == [x.id for x in posts]
+    assert 1 == len(plans.plans)
+
+    # NULL changes the SQL (IS NULL) so it is a new shape
+    posts = await Post.query().include('comments').where('creator_id', 'null').get()
+    assert [] == posts
+    assert 2 == len(plans.plans)
+
+
+@pytest.mark.asyncio
+async def test_limit_offset_rebinds(app1):
+    from app1.models.post import Post
+    posts = await Post.query().order_by('id').limit(2).offset(2).get()
+    assert [3, 4] == [x.id for x in posts]
+    posts = await Post.query().order_by('id').limit(2).offset(4).get()
+    assert [5, 6] == [x.id for x in posts]
+
+
+@pytest.mark.asyncio
+async def test_db_builder_rebinds_values(app1):
+    posts = await uvicore.db.query().table('posts').where('creator_id', 2).get()
+    assert [3, 4, 5] == [x.id for x in posts]
+    posts = await uvicore.db.query().table('posts').where('creator_id', 1).get()
+    assert [1, 2] == [x.id for x in posts]
@@ -64,6 +64,23 @@ async def test_where(app1):
     assert len(posts[2].tags) == 3
 
 
+@pytest.mark.asyncio
+async def test_where_exists(app1):
+    from app1.models.post import Post
+
+    # Wheres on a *Many relation are an EXISTS semi-join, the main query never joins
+    # the many-to-many tables so no DISTINCT is needed
+    query = Post.query().include('tags').where('tags.name', 'linux')
+    sql = query.sql()
+    assert 'EXISTS' in sql['main']
+    assert 'DISTINCT' not in sql['main']
+    assert 'post_tags' not in sql['main'].split('WHERE')[0]
+
+    # Both wheres must match the same tag
+    posts = await Post.query().include('tags').where('tags.name', 'linux').where('tags.name', 'bsd').get()
+    assert [] == posts
+
+
 @pytest.mark.asyncio
 async def test_where_through_one_to_many(app1):
     #from uvicore.auth.models.user import User
@@ -118,3 +135,49 @@ async def test_or_filter(app1):
     assert len(posts[0].tags) == 2
     assert len(posts[1].tags) == 1
     assert len(posts[6].tags) == 1
+
+
+@pytest.mark.asyncio
+async def test_where_selectin(app1):
+    from app1.models.post import Post
+
+    # Selectin loads tags by an IN list of post ids, chunked 2 at a time
+    posts = await Post.query().include('tags').where('tags.name', 'linux').selectin(2).get()
+    dump(posts)
+
+    # Should filter parent
+    assert [
+        'test-post1',
+        'test-post2',
+        'test-post7',
+    ] == [x.slug for x in posts]
+
+    # But not any children
+    assert len(posts[0].tags) == 5
+    assert len(posts[1].tags) == 2
+    assert len(posts[2].tags) == 3
+
+
+@pytest.mark.asyncio
+async def test_link_sync(app1):
+    from app1.models.post import Post
+    from app1.models.tag import Tag
+
+    tags = await Tag.query().key_by('name').get()
+    post = await Post.query().include('tags').find(1)
+    original = [x for x in post.tags]
+
+    # Linking already linked tags is skipped
+    await post.link('tags', original + [tags['lumen']])
+    post = await Post.query().include('tags').find(1)
+    assert sorted([x.name for x in original] + ['lumen']) == sorted([x.name for x in post.tags])
+
+    # Sync leaves exactly these tags
+    await post.sync('tags', [tags['lumen']])
+    post = await Post.query().include('tags').find(1)
+    assert ['lumen'] == [x.name for x in post.tags]
+
+    # Put them back
+    await post.sync('tags', original)
+    post = await Post.query().include('tags').find(1)
+    assert sorted([x.name for x in original]) == sorted([x.name for x in post.tags])
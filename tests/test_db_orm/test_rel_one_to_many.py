@@ -17,6 +17,25 @@ async def test_one_to_many(app1):
     ] == [x.title for x in post.comments]
 
 
+@pytest.mark.asyncio
+async def test_one_to_many_selectin(app1):
+    from app1.models.post import Post
+
+    # Limit applies to posts only, comments are loaded by IN list of post ids
+    posts = await Post.query().include('comments').order_by('id').limit(3).selectin().get()
+    assert 3 == len(posts)
+    assert [
+        'Post1 Comment1',
+        'Post1 Comment2'
+    ] == [x.title for x in posts[0].comments]
+    assert [] == posts[1].comments
+    assert [
+        'Post3 Comment1',
+        'Post3 Comment2',
+        'Post3 Comment3',
+    ] == [x.title for x in posts[2].comments]
+
+
 @pytest.mark.asyncio
 async def test_one_to_many_inverse(app1):
     from uvicore.auth.models.user import User
@@ -46,3 +65,31 @@ async def test_one_to_many_inverse(app1):
         'test-post3',
         'test-post3',
     ] == [x.post.slug for x in comments]
+
+
+@pytest.mark.asyncio
+async def test_one_to_many_include_plan(app1):
+    from app1.models.post import Post
+
+    # The include plan is built once and reused by the next query of the same shape
+    posts = await Post.query().include('creator', 'comments.creator').where('id', 1).get()
+    again = await Post.query().include('creator', 'comments.creator').where('id', 3).get()
+    assert ['Post1 Comment1', 'Post1 Comment2'] == [x.title for x in posts[0].comments]
+    assert ['Post3 Comment1', 'Post3 Comment2', 'Post3 Comment3'] == [x.title for x in again[0].comments]
+    assert all(x.creator is not None for x in again[0].comments)
+
+
+@pytest.mark.asyncio
+async def test_one_to_many_pinned(app1):
+    from app1.models.post import Post
+
+    # Relation queries run one after another on the pinned connection
+    async with uvicore.db.connect('app1'):
+        assert uvicore.db.pinned('app1')
+        post = await Post.query().include('comments', 'tags').find(1)
+    assert not uvicore.db.pinned('app1')
+    assert [
+        'Post1 Comment1',
+        'Post1 Comment2'
+    ] == [x.title for x in post.comments]
+    assert 0 < len(post.tags)
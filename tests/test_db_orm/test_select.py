@@ -0,0 +1,34 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_select(app1):
+    from app1.models.post import Post
+
+    posts = await Post.query().select('id', 'title').where('creator_id', 1).order_by('id').get()
+    assert [1, 2] == [x.id for x in posts]
+    assert posts[0].title is not None
+    assert posts[0].body is None
+
+    # Only selected fields are set
+    assert {'id', 'title'} == set(posts[0].dict(exclude_unset=True).keys())
+
+
+@pytest.mark.asyncio
+async def test_select_relations(app1):
+    from app1.models.post import Post
+
+    # Dotted fields include the relation and select only those relation fields
+    posts = await Post.query().select('title', 'creator.email', 'comments.title').where('id', 1).get()
+    post = posts[0]
+    assert post.body is None
+    assert 'anonymous@example.com' == post.creator.email
+    assert [
+        'Post1 Comment1',
+        'Post1 Comment2'
+    ] == [x.title for x in post.comments]
+    assert post.comments[0].body is None
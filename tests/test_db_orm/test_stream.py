@@ -0,0 +1,35 @@
+import pytest
+import uvicore
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_chunk(app1):
+    from app1.models.post import Post
+
+    # 7 posts in chunks of 3
+    chunks = []
+    async for posts in Post.query().include('creator', 'comments').order_by('id').chunk(3):
+        chunks.append(posts)
+    assert [3, 3, 1] == [len(x) for x in chunks]
+    assert [1, 2, 3] == [x.id for x in chunks[0]]
+
+    # *One and *Many relations are loaded per chunk
+    assert 'anonymous@example.com' == chunks[0][0].creator.email
+    assert [
+        'Post1 Comment1',
+        'Post1 Comment2'
+    ] == [x.title for x in chunks[0][0].comments]
+    assert 3 == len(chunks[0][2].comments)
+
+
+@pytest.mark.asyncio
+async def test_stream(app1):
+    from app1.models.post import Post
+
+    ids = []
+    async for post in Post.query().where('creator_id', 2).order_by('id').stream(chunk_size=2):
+        ids.append(post.id)
+    assert [3, 4, 5] == ids
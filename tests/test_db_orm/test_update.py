@@ -65,3 +65,37 @@ async def test_instance(app1):
 
     # Delete temp post
     await uvicore.db.query().table('posts').where('id', post.id).delete()
+
+
+@pytest.mark.asyncio
+async def test_dirty(app1):
+    # Saves of loaded models only update changed columns
+    from app1.models.post import Post
+
+    post = await Post.query().find(1)
+    assert {} == post._dirty()
+
+    post.other = 'other stuff1 changed'
+    assert {'other': 'other stuff1 changed'} == post._dirty()
+    await post.save()
+    assert {} == post._dirty()
+    assert 'other stuff1 changed' == (await Post.query().find(1)).other
+
+    # Partial models only write assigned fields
+    post = await Post.query().select('id', 'title').find(1)
+    post.other = 'other stuff1'
+    assert {'other': 'other stuff1'} == post._dirty()
+    await post.save()
+    post = await Post.query().find(1)
+    assert 'Test Post1' == post.title
+    assert 'other stuff1' == post.other
+
+    # Mutable values changed in place are still detected
+    post = await Post.query().find(1)
+    post.other = {'tags': ['a']}
+    post._snapshot()
+    post.other['tags'].append('b')
+    assert {'other': {'tags': ['a', 'b']}} == post._dirty()
+
+    # New models have no persisted state
+    assert Post(slug='x', title='x', body='x', creator_id=1, owner_id=1)._persisted is None
@@ -0,0 +1,54 @@
+import pytest
+import uvicore
+import sqlalchemy as sa
+from uvicore.support.dumper import dump
+
+# DB ORM
+
+
+@pytest.mark.asyncio
+async def test_upsert(app1):
+    from app1.models.post import Post
+
+    posts = [
+        {'slug': 'test-upsert1', 'title': 'Upsert1', 'body': 'Upsert1 body', 'creator_id': 1, 'owner_id': 2},
+        {'slug': 'test-upsert2', 'title': 'Upsert2', 'body': 'Upsert2 body', 'creator_id': 1, 'owner_id': 2},
+    ]
+
+    # New records are inserted
+    count = await Post.query().count()
+    await Post.upsert(posts, conflict=['slug'], update=['title'])
+    assert count + 2 == await Post.query().count()
+
+    # Existing records are updated, only the update fields
+    posts[0]['title'] = 'Upsert1 Changed'
+    posts[0]['body'] = 'Upsert1 body changed'
+    await Post.upsert(posts, conflict=['slug'], update=['title'])
+    assert count + 2 == await Post.query().count()
+    post = await Post.query().find(slug='test-upsert1')
+    assert 'Upsert1 Changed' == post.title
+    assert 'Upsert1 body' == post.body
+
+    # Delete temp posts
+    await uvicore.db.query().table('posts').where('unique_slug', 'in', ['test-upsert1', 'test-upsert2']).delete()
+
+
+@pytest.mark.asyncio
+async def test_upsert_builder(app1):
+    from sqlalchemy.dialects import mysql, postgresql, sqlite
+    query = uvicore.db.query('app1').table('posts')
+    table = query.query.table
+
+    # Each driver builds its own statement, compiled with its own dialect
+    saquery = query._build_upsert(table, [{'id': 1, 'title': 'x'}], ['id'], ['title'], driver='mysql')
+    assert 'ON DUPLICATE KEY UPDATE title = VALUES(title)' in str(saquery.compile(dialect=mysql.dialect()))
+
+    saquery = query._build_upsert(table, [{'id': 1, 'title': 'x'}], ['id'], ['title'], driver='sqlite')
+    assert 'ON CONFLICT (id) DO UPDATE SET title = excluded.title' in str(saquery.compile(dialect=sqlite.dialect()))
+
+    saquery = query._build_upsert(table, [{'id': 1, 'title': 'x'}], ['id'], ['title'], driver='postgresql')
+    assert 'ON CONFLICT (id) DO UPDATE SET title = excluded.title' in str(saquery.compile(dialect=postgresql.dialect()))
+
+    # No update columns only skips conflicting rows
+    saquery = query._build_upsert(table, [{'id': 1, 'title': 'x'}], ['id'], [], driver='postgresql')
+    assert 'ON CONFLICT (id) DO NOTHING' in str(saquery.compile(dialect=postgresql.dialect()))
@@ -169,4 +169,35 @@ async def test6(app1):
 
     assert x == 1
 
-# FIXME, missing async dispatch test
+
+
+@pytest.mark.asyncio
+async def test_has_listeners(app1):
+    """Has listeners - Exact and wildcard listeners, cache cleared on listen"""
+    assert uvicore.events.has_listeners('test-has-listeners-exact') == False
+    uvicore.events.listen('test-has-listeners-exact', lambda event: None)
+    assert uvicore.events.has_listeners('test-has-listeners-exact') == True
+
+    assert uvicore.events.has_listeners('test-has-listeners-wild-one') == False
+    uvicore.events.listen('test-has-listeners-wild-*', lambda event: None)
+    assert uvicore.events.has_listeners('test-has-listeners-wild-one') == True
+
+
+@pytest.mark.asyncio
+async def test_async_string_event(app1):
+    """Async - Dynamic string event, method handler, Dict payload"""
+
+    # Event Handler
+    x = 0
+    def handle(event: Dict):
+        nonlocal x; x = 1
+        assert event.stuff == 'here'
+        assert event.name == 'test-async-string'
+
+    # Event Listener
+    uvicore.events.listen('test-async-string', handle)
+
+    # Event Dispatcher
+    await uvicore.events.codispatch('test-async-string', {'stuff': 'here'})
+
+    assert x == 1
@@ -6,6 +6,7 @@ from uvicore.typing import Dict, Any, Callable, Union, List, Tuple
 from uvicore.support.dumper import dump, dd
 from uvicore.contracts import Cache as CacheInterface
 from uvicore.cache.manager import Manager
+from uvicore.cache.flight import SingleFlight, Stale, stale_entry, is_fresh
 
 @uvicore.service()
 class Array(CacheInterface):
@@ -15,6 +16,7 @@ class Array(CacheInterface):
         self.seconds = store.seconds
         self.items = {}
         self.items_ttl = {}
+        self.flights = SingleFlight()
 
     def connect(self, store: str = None) -> CacheInterface:
         """Connect to a cache backend store"""
@@ -51,22 +53,17 @@ class Array(CacheInterface):
                 # Item does not exist, set default
                 return default
 
-    async def remember(self, key: Union[str, Dict], callback: Union[Callable, Any] = None, *, seconds: int = None) -> Any:
-        """Get a key if exists, if not SET the key to callback value"""
+    async def remember(self, key: Union[str, Dict], callback: Union[Callable, Any] = None, *, seconds: int = None, stale: int = None) -> Any:
+        """Get a key if exists, if not SET the key to callback value
+
+        Concurrent callers of a missing key share one callback.  With stale seconds an expired
+        value is still returned for that long while one background task refreshes it.
+        """
         keys = self._prepair(key)
         if type(key) != dict: keys = {keys:callback}
         value = {}
         for key, callback in keys.items():
-            if self._has(key):
-                # Item exists, simply return value
-                value[key] = await self.get(key)
-            else:
-                # Item does not exist, set value based on callback return
-                if callable(callback):
-                    value[key] = await callback()
-                else:
-                    value[key] = callback
-                await self.put(key, value[key], seconds=seconds)
+            value[key] = await self._remember(key, callback, seconds, stale)
 
         if type(key) != dict:
             # Single key, single return
@@ -121,8 +118,8 @@ class Array(CacheInterface):
         value = 0
         if self._has(key): value = await self.get(key)
         if type(value) == int:
-            value += 1
-            self.put(key, value, seconds=seconds)
+            value += by
+            await self.put(key, value, seconds=seconds)
         return value
 
     async def decrement(self, key, by: int = 1, *, seconds: int = None) -> int:
@@ -132,8 +129,8 @@ class Array(CacheInterface):
         value = 0
         if self._has(key): value = await self.get(key)
         if type(value) == int:
-            value -= 1
-            self.put(key, value, seconds=seconds)
+            value -= by
+            await self.put(key, value, seconds=seconds)
         return value
 
     async def forget(self, key: Union[str, List]) -> None:
@@ -155,6 +152,27 @@ class Array(CacheInterface):
         for key in delete:
             del self.items[key]
 
+    async def _remember(self, key: str, callback: Union[Callable, Any], seconds: int = None, stale: int = None) -> Any:
+        if seconds is None: seconds = self.seconds
+        if not self._has(key):
+            # Item does not exist, all concurrent callers wait for one callback
+            return await self.flights.run(key, lambda: self._refresh(key, callback, seconds, stale))
+
+        entry = await self.get(key)
+        if not isinstance(entry, Stale): return entry
+
+        # Serve the stale value while one task refreshes it
+        if not is_fresh(entry): self.flights.start(key, lambda: self._refresh(key, callback, seconds, stale))
+        return entry['value']
+
+    async def _refresh(self, key: str, callback: Union[Callable, Any], seconds: int, stale: int = None) -> Any:
+        value = await callback() if callable(callback) else callback
+        if stale and seconds:
+            await self.put(key, stale_entry(value, seconds), seconds=seconds + stale)
+        else:
+            await self.put(key, value, seconds=seconds)
+        return value
+
     def _has(self, key: str) -> bool:
         # This is an internal _has() only.  Why?  Because the public facing
         # has is async def.  But it doesn't need to be.  Need to keep public
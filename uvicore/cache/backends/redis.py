@@ -1,11 +1,14 @@
 import pickle
+import asyncio
 import uvicore
+from time import time
 from uvicore.typing import Dict, Any, Callable, Union, List, Tuple
 from uvicore.support.dumper import dump, dd
 from uvicore.redis import Redis as RedisDb
 from aioredis import Redis as RedisInterface
 from uvicore.contracts import Cache as CacheInterface
 from uvicore.cache.manager import Manager
+from uvicore.cache.flight import SingleFlight, Stale, stale_entry, is_fresh
 
 
 @uvicore.service()
@@ -16,6 +19,8 @@ class Redis(CacheInterface):
         self.connection = store.connection
         self.prefix = store.prefix
         self.seconds = store.seconds
+        self.lock_seconds = store.lock_seconds or 10
+        self.flights = SingleFlight()
         self._redis = None
 
     def connect(self, store: str = None) -> CacheInterface:
@@ -53,23 +58,17 @@ class Redis(CacheInterface):
                 # Item does not exist, set default
                 return default
 
-    async def remember(self, key: Union[str, Dict], callback: Union[Callable, Any] = None, *, seconds: int = None) -> Any:
-        """Get a key if exists, if not SET the key to callback value"""
+    async def remember(self, key: Union[str, Dict], callback: Union[Callable, Any] = None, *, seconds: int = None, stale: int = None) -> Any:
+        """Get a key if exists, if not SET the key to callback value
+
+        Concurrent callers of a missing key share one callback.  With stale seconds an expired
+        value is still returned for that long while one background task refreshes it.
+        """
         (redis, keys) = await self._prepair(key)
         if type(key) != dict: keys = {keys:callback}
         value = {}
         for key, callback in keys.items():
-            if await self.has(key):
-                # Item exists, simply return value
-                #value[key] = await redis.get(key)
-                value[key] = await self.get(key)
-            else:
-                # Item does not exist, set value based on callback return
-                if callable(callback):
-                    value[key] = await callback()
-                else:
-                    value[key] = callback
-                await self.put(key, value[key], seconds=seconds)
+            value[key] = await self._remember(key, callback, seconds, stale)
 
         if type(key) != dict:
             # Single key, single return
@@ -150,6 +149,42 @@ class Redis(CacheInterface):
         keys = await redis.keys(self.prefix + '*')
         await redis.delete(*keys)
 
+    async def _remember(self, key: str, callback: Union[Callable, Any], seconds: int = None, stale: int = None) -> Any:
+        if seconds is None: seconds = self.seconds
+        if not await self.has(key):
+            # Item does not exist, all concurrent callers in this worker wait for one callback
+            return await self.flights.run(key, lambda: self._refresh(key, callback, seconds, stale))
+
+        entry = await self.get(key)
+        if not isinstance(entry, Stale): return entry
+
+        # Serve the stale value while one task refreshes it
+        if not is_fresh(entry): self.flights.start(key, lambda: self._refresh(key, callback, seconds, stale))
+        return entry['value']
+
+    async def _refresh(self, key: str, callback: Union[Callable, Any], seconds: int, stale: int = None) -> Any:
+        # Only one worker runs the callback, the others wait for its value
+        (redis, lock) = await self._prepair(key + ':lock')
+        locked = await redis.set(lock, '1', expire=self.lock_seconds, exist=RedisInterface.SET_IF_NOT_EXIST)
+        if not locked:
+            deadline = time() + self.lock_seconds
+            while time() < deadline:
+                if await self.has(key):
+                    entry = await self.get(key)
+                    return entry['value'] if isinstance(entry, Stale) else entry
+                if not await redis.exists(lock): break
+                await asyncio.sleep(0.05)
+
+        try:
+            value = await callback() if callable(callback) else callback
+            if stale and seconds:
+                await self.put(key, stale_entry(value, seconds), seconds=seconds + stale)
+            else:
+                await self.put(key, value, seconds=seconds)
+        finally:
+            if locked: await redis.delete(lock)
+        return value
+
     async def _prepair(self, key: Union[str, List] = None) -> Tuple[RedisInterface, Union[str, List, Dict]]:
         # Connect to redis pool if not connected
         if not self._redis:
@@ -0,0 +1,49 @@
+import asyncio
+import uvicore
+from time import time
+from uvicore.typing import Any, Awaitable, Callable, Dict, Optional
+from uvicore.support.dumper import dump, dd
+
+
+@uvicore.service()
+class SingleFlight:
+    """Share one running computation per key between all concurrent callers
+
+    The first caller of a key starts the computation, every other caller awaits the same
+    future.  A caller being cancelled never cancels the shared computation.
+    """
+
+    def __init__(self):
+        self.flights: Dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute() once for all concurrent callers of this key"""
+        return await asyncio.shield(self.start(key, compute))
+
+    def start(self, key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Start compute() unless already running for this key, without waiting for it"""
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = self.flights[key] = asyncio.ensure_future(compute())
+            flight.add_done_callback(lambda done: self._done(key, done))
+        return flight
+
+    def _done(self, key: str, flight: asyncio.Future) -> None:
+        if self.flights.get(key) is flight: del self.flights[key]
+
+        # Background refreshes have no caller, retrieve any exception so it is not reported as never retrieved
+        if not flight.cancelled(): flight.exception()
+
+
+# Stale-while-revalidate entries hold the value and when it stops being fresh.  Their cache TTL
+# is seconds + stale so the old value is still there to serve while one task refreshes it.
+class Stale(dict):
+    pass
+
+
+def stale_entry(value: Any, seconds: int) -> Stale:
+    return Stale(value=value, fresh=time() + seconds)
+
+
+def is_fresh(entry: Stale) -> bool:
+    return time() < entry['fresh']
@@ -38,9 +38,21 @@ class QueryBuilder(Generic[B, E], ABC):
         """Limit offset"""
 
     @abstractmethod
-    def cache(self, name: str = None) -> B[B, E]:
+    def cache(self, key: str = None, *, seconds: int = None, stale: int = None) -> B[B, E]:
         """Cache results, None seconds uses cache backend default, 0=forever"""
 
+    @abstractmethod
+    async def count(self) -> int:
+        """Execute a SELECT COUNT query and return the number of rows found"""
+
+    @abstractmethod
+    async def exists(self) -> bool:
+        """Execute a SELECT EXISTS query and return True if any rows are found"""
+
+    @abstractmethod
+    async def aggregate(self, **aggregates: Tuple) -> Dict:
+        """Execute aggregate functions as name=(function, column) and return a Dict of results"""
+
     @abstractmethod
     def sql(self, method: str = 'select') -> str:
         """Get all SQL queries involved in this query builder"""
@@ -75,6 +87,10 @@ class DbQueryBuilder(QueryBuilder[B, E], ABC):
     async def get(self) -> List[RowProxy]:
         """Execute select query and return all rows found"""
 
+    @abstractmethod
+    async def upsert(self, rows: List[Dict], conflict: List[str] = None, update: List[str] = None, *, chunk_size: int = None) -> None:
+        """Insert rows, updating the existing row on a unique key conflict"""
+
     @abstractmethod
     async def delete(self) -> None:
         """Execute delete query"""
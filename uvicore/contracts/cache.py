@@ -21,8 +21,12 @@ class Cache(ABC):
         """Get one or more key values if exists else return default value"""
 
     @abstractmethod
-    async def remember(self, key: str, callback: Callable, *, seconds: int = 0) -> Any:
-        """Get a key if exists, if not SET the key to callback value"""
+    async def remember(self, key: str, callback: Callable, *, seconds: int = 0, stale: int = None) -> Any:
+        """Get a key if exists, if not SET the key to callback value
+
+        Concurrent callers of a missing key share one callback.  With stale seconds an expired
+        value is still returned for that long while one background task refreshes it.
+        """
 
     @abstractmethod
     async def put(self, key: Union[str, Dict], value: Any = None, *, seconds: int = 0) -> None:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union, Mapping, Optional
+from typing import Any, AsyncContextManager, AsyncGenerator, Dict, List, Union, Mapping, Optional
 
 try:
     from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
@@ -106,6 +106,11 @@ class Database(ABC):
         """Get one Encode Database by connection str or metakey"""
         pass
 
+    @abstractmethod
+    async def warmup(self, connection: str = None, metakey: str = None) -> None:
+        """Connect and open the minimum pooled connections of one or all databases"""
+        pass
+
     @abstractmethod
     async def disconnect(self, connection: str = None, metakey: str = None, from_all: bool = False) -> None:
         """Disconnect from a database by connection str or metakey.  Of ALL databases."""
@@ -126,6 +131,31 @@ class Database(ABC):
         """Execute a SQLAlchemy Core Query based on connection str or metakey"""
         pass
 
+    @abstractmethod
+    def connect(self, connection: str = None, metakey: str = None) -> AsyncContextManager:
+        """Pin one pooled connection to this context for all queries on this database"""
+        pass
+
+    @abstractmethod
+    def pinned(self, connection: str = None, metakey: str = None) -> bool:
+        """Check if connect() or transaction() pinned a connection of this database to this context"""
+        pass
+
+    @abstractmethod
+    def transaction(self, connection: str = None, metakey: str = None) -> AsyncContextManager:
+        """Run all queries on this database inside one transaction, committed at the end"""
+        pass
+
+    @abstractmethod
+    async def invalidate(self, tables: Union[str, List[str]], connection: str = None, metakey: str = None) -> None:
+        """Invalidate all cached query results that read these tables"""
+        pass
+
+    @abstractmethod
+    async def iterate(self, query: Union[ClauseElement, str], values: Dict = None, connection: str = None, metakey: str = None) -> AsyncGenerator[Row, None]:
+        """Iterate a SQLAlchemy Core Query row by row from the database cursor"""
+        pass
+
     @abstractmethod
     def query(self, connection: str = None) -> DbQueryBuilder[DbQueryBuilder, None]:
         """Database query builder passthrough"""
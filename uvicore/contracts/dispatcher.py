@@ -34,6 +34,11 @@ class Dispatcher(ABC):
     #     """Register an event with the system.  Retrieve with .events property"""
     #     pass
 
+    @abstractmethod
+    def has_listeners(self, event: Union[str, Callable]) -> bool:
+        """Check if an event has any listeners including wildcards"""
+        pass
+
     @abstractmethod
     def listen(self, events: Union[str, List], listener: Union[str, Callable] = None, *, priority: int = 50) -> None:
         """Append a listener (string or method) callback to one or more events"""
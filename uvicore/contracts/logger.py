@@ -28,6 +28,10 @@ class Logger(ABC):
     def reset(self):
         """Clear logger name"""
 
+    @abstractmethod
+    def enabled(self, level: str = 'INFO') -> bool:
+        """Check if a message at this level for the current name would be output"""
+
     @abstractmethod
     def dump(self, *args):
         """Dump message"""
@@ -13,7 +13,7 @@ class Mapper(ABC):
         """Convert a table column name into a model field name"""
 
     @abstractmethod
-    def model(self, perform_mapping: bool = True):
+    def model(self, perform_mapping: bool = True, only: List = None, trusted: bool = False):
         """Convert a dict or List[dict] into a model or List[Model]
 
         Only maps table->model fields if perform_mapping = True, else assume already model fields.
@@ -21,6 +21,8 @@ class Mapper(ABC):
         Works on a list of dict - entity.mapper(ListOfDictModel).model()
         Passes through if already a Model or List[Model]
         If mixed List of Dict and Model, converts all to Models
+        If only is a List of field names, rows convert to partial models of just those fields
+        If trusted, rows from our own database convert to models without pydantic validation
         """
 
     @abstractmethod
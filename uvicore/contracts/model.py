@@ -39,7 +39,11 @@ class Model(Generic[E], ABC):
         """
 
     @abstractmethod
-    async def insert_with_relations(entity, models: List[Dict]) -> None:
+    async def upsert(entity, models: Union[E, Dict, List[E], List[Dict]], conflict: List[str] = None, update: List[str] = None) -> None:
+        """Insert one or more entities, updating the existing record on a unique key conflict"""
+
+    @abstractmethod
+    async def insert_with_relations(entity, models: List[Dict], *, batch: bool = False) -> None:
         """Insert one or more entities as List of Dict that DO have relations included
 
         Because relations are included, this insert is NOT bulk and must
@@ -83,6 +87,10 @@ class Model(Generic[E], ABC):
     async def unlink(self, relation_name: str, models: Union[Any, List[Any]] = None) -> None:
         """Unlink records to relation using the Many-To-Many pivot table"""
 
+    @abstractmethod
+    async def sync(self, relation_name: str, models: Union[Any, List[Any]]) -> None:
+        """Link exactly these records to relation, unlinking all others, using the Many-To-Many pivot table"""
+
     @abstractmethod
     async def _before_insert(self) -> None:
         """Hook fired before record is inserted (new records only)"""
@@ -44,11 +44,9 @@ class Database(Handler):
         # Connect to all databases one time, after the system has started up
         @uvicore.events.handle(['uvicore.console.events.command.Startup', 'uvicore.http.events.server.Startup'])
         async def uvicore_startup(event):
-            # Loop each database and connect()
+            # Connect each database and open its minimum pooled connections
             # I used to do it on-the-fly in db.py but was getting pool errors
-            for metakey, database in uvicore.db.databases.items():
-                if not database.is_connected:
-                    await database.connect()
+            await uvicore.db.warmup()
 
         # Disconnect from all databases after the system has shutdown
         @uvicore.events.handle(['uvicore.console.events.command.Shutdown', 'uvicore.http.events.server.Shutdown'])
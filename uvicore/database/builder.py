@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 import operator as operators
-from copy import deepcopy
-from typing import Any, Dict, Generic, List, Tuple, TypeVar, Union, OrderedDict
+import threading
+from copy import copy
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union, OrderedDict
 from uvicore.support import hash
 
 import sqlalchemy as sa
-from sqlalchemy.sql.expression import BinaryExpression
+from sqlalchemy.sql.expression import BinaryExpression, BindParameter
 
 from sqlalchemy.sql import quoted_name
 from collections import OrderedDict as ODict
 from dataclasses import dataclass
 
 import uvicore
+from uvicore.database import tags
 from uvicore.contracts import QueryBuilder as BuilderInterface
 from uvicore.support.dumper import dd, dump
 
@@ -118,15 +120,36 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
         self.query.offset = offset
         return self
 
-    def cache(self, key: str = None, *, seconds: int = None) -> B[B, E]:
-        """Cache results, None seconds uses cache backend default, 0=forever"""
+    def cache(self, key: str = None, *, seconds: int = None, stale: int = None) -> B[B, E]:
+        """Cache results, None seconds uses cache backend default, 0=forever
+
+        With stale seconds, expired results are still returned for that long while one task refreshes them.
+        """
         # Seconds as None will default to cache configured default seconds
         self.query.cache = {
             'key': key,
             'seconds': seconds,
+            'stale': stale,
         }
         return self
 
+    async def count(self) -> int:
+        """Execute a SELECT COUNT query and return the number of rows found"""
+        return await self._fetch_aggregate('count')
+
+    async def exists(self) -> bool:
+        """Execute a SELECT EXISTS query and return True if any rows are found"""
+        return await self._fetch_aggregate('exists')
+
+    async def aggregate(self, **aggregates: Tuple) -> Dict:
+        """Execute aggregate functions as name=(function, column) and return a Dict of results
+
+        Functions are count, sum, avg, min and max.
+        .aggregate(total=('sum', 'price'), newest=('max', 'created_at'))
+        """
+        if not aggregates: raise Exception('Aggregate requires at least one name=(function, column)')
+        return await self._fetch_aggregate('aggregate', aggregates)
+
     def sql(self, method: str = 'select') -> str:
         """Get all SQL queries involved in this query builder"""
         query, saquery = self._build_query('select', self.query.copy())
@@ -143,7 +166,10 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
         # insert will never come into this get() or build function
         if method == 'select':
             # Build .select() query from tables, joins and selectable columns
-            saquery = self._build_select(query).distinct()
+            saquery = self._build_select(query)
+
+            # DISTINCT only if rows can be duplicated, it forces a sort or hash of every row
+            if self._distinct(query): saquery = saquery.distinct()
 
             # Build .select_from() query from tables and joins
             saquery = self._build_from(query, saquery)
@@ -155,10 +181,10 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
             saquery = self._build_group_by(query, saquery)
 
             # Build .limit() query
-            if query.limit: saquery = saquery.limit(query.limit)
+            if self._is_set(query.limit): saquery = saquery.limit(query.limit)
 
             # Build .offset query
-            if query.offset: saquery = saquery.offset(query.offset)
+            if self._is_set(query.offset): saquery = saquery.offset(query.offset)
 
         elif method == 'delete':
             # Build .delete() query from table
@@ -168,6 +194,19 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
             # Build .update() query from table
             saquery = sa.update(query.table)
 
+        # Build WHERE AND and WHERE OR queries
+        saquery = self._build_wheres(query, saquery)
+
+        # Return query and SQLAlchemy query
+        return (query, saquery)
+
+    def _distinct(self, query: Query) -> bool:
+        # Joins may fan out rows and explicit selects may repeat values.  A whole table
+        # with a primary key is always unique.
+        if query.distinct is not None: return query.distinct
+        return bool(query.joins or query.selects) or self._pk_column(query) is None
+
+    def _build_wheres(self, query: Query, saquery):
         # Build WHERE AND queries
         if query.wheres:
             where_ands = self._build_where(query, query.wheres)
@@ -177,11 +216,235 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
         if query.or_wheres:
             where_ors = self._build_where(query, query.or_wheres)
             saquery = saquery.where(sa.or_(*where_ors))
+        return saquery
 
+    def _build_aggregate(self, method: str, query: Query, aggregates: Dict = None):
+        # Count, exists and aggregate queries use the same FROM, joins and WHERE as a select
+        # but ignore order_by, limit and offset.  They always return a single row.
+        if method == 'count':
+            pk = self._pk_column(query)
+            if query.group_by:
+                # Count the groups, not the rows
+                inner = copy(query)
+                inner.order_by = []
+                inner.limit = None
+                inner.offset = None
+                inner, subquery = self._build_query('select', inner)
+                return sa.select(sa.func.count()).select_from(subquery.alias())
+            elif self._distinct(query) and query.joins and pk is not None:
+                # Joins may fan out rows, count each main table row only once
+                columns = [sa.func.count(sa.distinct(pk))]
+            else:
+                columns = [sa.func.count()]
+
+        elif method == 'exists':
+            inner = self._build_wheres(query, self._build_from(query, sa.select(sa.literal(1))))
+            return sa.select(sa.exists(inner))
+
+        elif method == 'aggregate':
+            columns = []
+            for name, (function, column) in aggregates.items():
+                sacol = self._column(column, query).sacol
+                columns.append(self._aggregate_function(function)(sacol).label(name))
+
+        saquery = self._build_from(query, sa.select(*columns))
+        return self._build_wheres(query, saquery)
+
+    def _build_planned_aggregate(self, method: str, aggregates: Dict = None):
+        """Build a count, exists or aggregate query from the plan cache"""
+        shape = self._plan_shape(method, self.query)
+        if shape is not None and aggregates:
+            try:
+                shape += tuple((name, function, self._plan_column(column)) for name, (function, column) in aggregates.items())
+            except ValueError:
+                shape = None
+        if shape is None:
+            return self._build_aggregate(method, self._aggregate_query(copy(self.query)), aggregates)
+
+        query, values = self._parameterize(self.query)
+        saquery = plans.get(shape)
+        if saquery is None:
+            saquery = self._build_aggregate(method, self._aggregate_query(query), aggregates)
+            plans.put(shape, saquery)
+            return saquery
+        if values: saquery = saquery.params(values)
+        return saquery
 
-        # Return query and SQLAlchemy query
+    def _aggregate_query(self, query: Query) -> Query:
+        # Hook for the ORM to add its relation joins
+        return query
+
+    async def _fetch_aggregate(self, method: str, aggregates: Dict = None) -> Any:
+        saquery = self._build_planned_aggregate(method, aggregates)
+
+        async def fetch():
+            row = await uvicore.db.fetchone(saquery, connection=self._connection())
+            if method == 'count': return row[0]
+            if method == 'exists': return bool(row[0])
+            return {name: row[i] for i, name in enumerate(aggregates.keys())}
+
+        # No caching, execute query
+        cache = self.query.cache
+        if not cache: return await fetch()
+
+        if cache.get('key') is None:
+            # Every page of the same query has the same result, don't hash the paging
+            query = copy(self.query)
+            query.order_by = []
+            query.limit = None
+            query.offset = None
+            query.keyset = False
+            query.after = None
+            key = 'uvicore.database/' + query.hash(
+                hash_type='sha1',
+                package='uvicore.database',
+                builder=self.__class__.__name__,
+                method=method,
+                aggregates=aggregates,
+                connection=self._connection(),
+            )
+        else:
+            key = 'uvicore.database/' + cache.get('key')
+
+        # Cached results are only used if none of their tables were written since
+        key = tags.versioned(key, await self._cache_versions(self.query))
+        return await uvicore.cache.remember(key, fetch, seconds=cache.get('seconds'), stale=cache.get('stale'))
+
+    async def _cache_versions(self, query: Query) -> Dict:
+        """Current versions of all tables read by this query, see uvicore.database.tags"""
+        return await tags.versions(uvicore.db.metakey(self._connection()), self._cache_tables(query))
+
+    def _cache_tables(self, query: Query) -> List[str]:
+        """Names of all tables read by this query"""
+        names = [query.table.name] if query.table is not None else []
+        names.extend([join.table.name for join in query.joins])
+        return list(dict.fromkeys(names))
+
+    def _aggregate_function(self, function: str):
+        functions = {
+            'count': sa.func.count,
+            'sum': sa.func.sum,
+            'avg': sa.func.avg,
+            'min': sa.func.min,
+            'max': sa.func.max,
+        }
+        if function not in functions:
+            raise Exception('Unknown aggregate function {}, use one of {}'.format(function, ', '.join(functions.keys())))
+        return functions[function]
+
+    def _pk_column(self, query: Query) -> Optional[sa.Column]:
+        if not isinstance(query.table, sa.Table): return None
+        for column in query.table.primary_key.columns:
+            return column
+        return None
+
+    def _build_planned_query(self, method: str) -> Tuple:
+        """Build query from the plan cache, only rebinding parameter values"""
+        # Only selects are planned.  SQLAlchemy cannot rebind params() of an UPDATE or DELETE.
+        shape = self._plan_shape(method, self.query) if method == 'select' else None
+        if shape is None:
+            # Query contains raw SQLAlchemy expressions and cannot be planned
+            return self._build_query(method, copy(self.query))
+
+        query, values = self._parameterize(self.query)
+        plan = plans.get(shape)
+        if plan is None:
+            plan = self._build_query(method, query)
+            plans.put(shape, plan)
+            return plan
+
+        query, saquery = plan
+        if values: saquery = saquery.params(values)
         return (query, saquery)
 
+    def _plan_shape(self, method: str, query: Query) -> Optional[Tuple]:
+        """Hashable shape of a query used as the plan cache key, None if not plannable"""
+        # The shape is everything that changes the SQL, but not the values.  Where
+        # values only add their NULL-ness because NULL compiles to IS NULL.
+        try:
+            return (
+                method,
+                self._connection(),
+                str(getattr(query.table, 'name', query.table)),
+                tuple(self._plan_column(x) for x in query.selects),
+                tuple(self._plan_where(x) for x in query.wheres),
+                tuple(self._plan_where(x) for x in query.or_wheres),
+                tuple(self._plan_where(x) for x in query.filters),
+                tuple(self._plan_where(x) for x in query.or_filters),
+                tuple(self._plan_column(x) for x in query.group_by),
+                tuple(self._plan_order(x) for x in query.order_by),
+                tuple(self._plan_order(x) for x in query.sort),
+                tuple(self._plan_join(x) for x in query.joins),
+                bool(query.limit),
+                bool(query.offset),
+                query.keyset,
+                len(query.after) if query.after else 0,
+            )
+        except ValueError:
+            return None
+
+    def _plan_column(self, column: Any) -> Any:
+        if type(column) == str: return column
+        if isinstance(column, sa.Column): return (str(column.table.name), str(column.name))
+        raise ValueError('Column expressions cannot be planned')
+
+    def _plan_where(self, where: Any) -> Tuple:
+        if type(where) != tuple: raise ValueError('Where expressions cannot be planned')
+        column, operator, value = where
+        return (self._plan_column(column), operator, self._is_null(value))
+
+    def _plan_order(self, order_by: Any) -> Tuple:
+        if type(order_by) != tuple: raise ValueError('Order expressions cannot be planned')
+        return (self._plan_column(order_by[0]), order_by[1])
+
+    def _plan_join(self, join: Join) -> Tuple:
+        if join.left is None or join.right is None: raise ValueError('Join expressions cannot be planned')
+        return (
+            join.tablename, join.alias, join.method,
+            self._plan_column(join.left.sacol), self._plan_column(join.right.sacol),
+        )
+
+    def _parameterize(self, query: Query) -> Tuple:
+        """Copy of query with all where, limit and offset values as named bind parameters"""
+        query = copy(query)
+        values = {}
+
+        def bind(prefix: str, wheres: List[Tuple]) -> List[Tuple]:
+            bound = []
+            for i, (column, operator, value) in enumerate(wheres):
+                if not self._is_null(value):
+                    name = prefix + str(i)
+                    values[name] = value
+                    value = sa.bindparam(name, value, expanding=operator in ('in', '!in'))
+                bound.append((column, operator, value))
+            return bound
+
+        query.wheres = bind('plan_where_', query.wheres)
+        query.or_wheres = bind('plan_or_where_', query.or_wheres)
+        query.filters = bind('plan_filter_', query.filters)
+        query.or_filters = bind('plan_or_filter_', query.or_filters)
+        if query.limit:
+            values['plan_limit'] = query.limit
+            query.limit = sa.bindparam('plan_limit', query.limit)
+        if query.offset:
+            values['plan_offset'] = query.offset
+            query.offset = sa.bindparam('plan_offset', query.offset)
+        if query.after:
+            after = []
+            for i, value in enumerate(query.after):
+                name = 'plan_after_' + str(i)
+                values[name] = value
+                after.append(sa.bindparam(name, value))
+            query.after = after
+        return (query, values)
+
+    def _is_null(self, value: Any) -> bool:
+        return value is None or (type(value) == str and value.lower() == 'null')
+
+    def _is_set(self, value: Any) -> bool:
+        # Limit and offset may be bind parameters from a planned query
+        return isinstance(value, BindParameter) or bool(value)
+
     def _build_group_by(self, query: Query, saquery):
         for column in query.group_by:
             column = self._column(column, query)
@@ -343,6 +606,42 @@ class QueryBuilder(Generic[B, E], BuilderInterface[B, E]):
 
 
 
+class PlanCache:
+    """Bounded LRU of built SQLAlchemy queries keyed by query shape"""
+
+    def __init__(self, size_config: str = 'plan_cache_size'):
+        self.plans = ODict()
+        self.size = None
+        self.size_config = size_config
+
+        # Offloaded ORM results are hydrated in worker threads, see OrmQueryBuilder.offload()
+        self.lock = threading.Lock()
+
+    def get(self, shape: Tuple) -> Any:
+        with self.lock:
+            plan = self.plans.get(shape)
+            if plan is not None: self.plans.move_to_end(shape)
+            return plan
+
+    def put(self, shape: Tuple, plan: Any) -> None:
+        if self.size is None:
+            # Read config on first use, database.plan_cache_size=0 disables plan caching
+            size = uvicore.config.app.database[self.size_config]
+            self.size = size if type(size) == int else 500
+        with self.lock:
+            self.plans[shape] = plan
+            while len(self.plans) > self.size:
+                self.plans.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.plans.clear()
+
+
+# Shared by all DB and ORM query builders
+plans = PlanCache()
+
+
 # IoC Class Instance
 # No need to IoC this one because it is always inherited
 # If you need to overrite it use the IoC to swap DbQueryBuilder or OrmQueryBuilder
@@ -450,7 +749,15 @@ class Query:
     keyed_by: Optional[str]
     show_writeonly: Union[bool, List]
     cache: Dict
+    concurrency: Optional[int]
+    selectin: Union[bool, int]
+    trusted: Optional[bool]
+    offload: Optional[bool]
+    distinct: Optional[bool]
+    keyset: bool
+    after: Optional[List]
     relations: OrderedDict[str, Relation]
+    include_plan: Optional[Dict]
     joins: List[Join]
     table: sa.Table
 
@@ -470,24 +777,40 @@ class Query:
         self.keyed_by: Optional[str] = None
         self.show_writeonly: Union[bool, List] = False
         self.cache: Dict = None
+        self.concurrency: Optional[int] = None
+        self.selectin: Union[bool, int] = False
+        self.trusted: Optional[bool] = None
+        self.offload: Optional[bool] = None
+        self.distinct: Optional[bool] = None
+        self.keyset: bool = False
+        self.after: Optional[List] = None
         self.relations: OrderedDict[str, Relation] = ODict()
+        self.include_plan: Optional[Dict] = None
         self.joins: List[Join] = []
         self.table: sa.Table = None
 
     def copy(self):
-        # Objects are always byref in python.  We want a complete deep clone
-        # of a query.  Must use deep or it won't copy the .joins since its a
-        # list of an actual class also.  Shallow copies all lists and dicts, but
-        # not classes or list of classes, they will be byref unless deep
-        table = self.table
-        self.table = None
-        newquery = deepcopy(self)
-        self.table = table
-
-        # Copy the original table by ref back or else SQLAlchemy will see a new
-        # table class ID and think you are joining 2 different tables.  We must keep
-        # the exact instance of each table.
-        newquery.table = table
+        # Copy-on-write clone of a query.  Every list and dict gets a new container
+        # so a builder step can append to or replace it without touching the original.
+        # The items inside (where tuples, Joins, Relations) are never modified once added
+        # so they are shared by ref instead of deepcopied.  The table must always be the
+        # exact same instance or else SQLAlchemy will see a new table class ID and think
+        # you are joining 2 different tables.
+        newquery = copy(self)
+        newquery.includes = list(self.includes)
+        newquery.selects = list(self.selects)
+        newquery.wheres = list(self.wheres)
+        newquery.or_wheres = list(self.or_wheres)
+        newquery.filters = list(self.filters)
+        newquery.or_filters = list(self.or_filters)
+        newquery.group_by = list(self.group_by)
+        newquery.order_by = list(self.order_by)
+        newquery.sort = list(self.sort)
+        if type(self.show_writeonly) == list: newquery.show_writeonly = list(self.show_writeonly)
+        if self.cache is not None: newquery.cache = dict(self.cache)
+        newquery.relations = ODict(self.relations)
+        newquery.include_plan = None
+        newquery.joins = list(self.joins)
         return newquery
 
     def hash(self, *, hash_type: str = 'sha1', **kwargs) -> str:
@@ -506,6 +829,8 @@ class Query:
             'limit': self.limit,
             'offset': self.offset,
             'keyed_by': self.keyed_by,
+            'keyset': self.keyset,
+            'after': self.after,
             'kwargs': kwargs,
         }
         hash_method = getattr(hash, hash_type)
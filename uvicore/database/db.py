@@ -1,11 +1,18 @@
-from uvicore.typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Union
+import time
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from uvicore.typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Tuple, Union
 
 import sqlalchemy as sa
 from sqlalchemy.sql import ClauseElement
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 
 import uvicore
 from uvicore.contracts import Connection
 from uvicore.contracts import Database as DatabaseInterface
+from uvicore.database import tags
+from uvicore.database.builder import PlanCache
 from uvicore.database.query import DbQueryBuilder
 from uvicore.support.dumper import dd, dump
 
@@ -14,6 +21,21 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSessio
 from sqlalchemy.pool import NullPool
 from sqlalchemy import Table, MetaData
 from aio_databases import Database
+from aio_databases.record import Record
+
+
+# Connections pinned to the current context (usually one HTTP request) by connect() as
+# {metakey: Dict(write=connection, read=replica connection or None, transactions=open transaction() count)}
+_pinned: ContextVar[Optional[Dict]] = ContextVar('uvicore.database.pinned', default=None)
+
+# Tables written inside the outermost transaction() as {(metakey, table)}, invalidated again once committed
+_written: ContextVar[Optional[set]] = ContextVar('uvicore.database.written', default=None)
+
+# Last write time of each metakey in the current context, reads stay on the primary for a while after
+_sticky: ContextVar[Optional[Dict]] = ContextVar('uvicore.database.sticky', default=None)
+
+# Compiled SQL of each statement structure and dialect, bounded by database.compiled_cache_size
+compiled = PlanCache('compiled_cache_size')
 
 @uvicore.service('uvicore.database.db.Db',
     aliases=['Database', 'database', 'db'],
@@ -51,6 +73,13 @@ class Db(DatabaseInterface):
         self._engines = Dict()
         self._databases = Dict()
         self._metadatas = Dict()
+        self._pools = Dict()
+        self._dialects = Dict()
+
+        # Read and write host Databases of connections with replicas, connections in use and round robin turns
+        self._hosts = Dict()
+        self._busy = {}
+        self._turns = {}
 
     def init(self, default: str, connections: Dict[str, Connection]) -> None:
         self._default = default
@@ -62,25 +91,87 @@ class Db(DatabaseInterface):
             if connection.metakey in self.metadatas: continue
 
             if connection.backend == 'sqlalchemy':
-                # Build encode/databases specific connection URL
-                # connection.url has a dialect in it, which we need for engines
-                # but don't need for encode/databases library
-                if connection.driver == 'sqlite':
-                    encode_url = (connection.driver
-                        + ':///' + connection.database
-                    )
-                else:
-                    encode_url = (connection.driver
-                        + '://' + connection.username
-                        + ':' + connection.password
-                        + '@' + connection.host
-                        + ':' + str(connection.port)
-                        + '/' + connection.database
-                    )
-                self._engines[connection.metakey] = create_async_engine(connection.url, echo=True, poolclass=NullPool,)
-                self._databases[connection.metakey] = Database(encode_url)
+                self._pools[connection.metakey] = connection.pool
+                self._dialects[connection.metakey] = self._dialect(connection)
+                self._engines[connection.metakey] = create_async_engine(connection.url, echo=bool(connection.echo), **self._engine_pool(connection))
                 self._metadatas[connection.metakey] = MetaData()
 
+                # Optional read replicas and write hosts, each with its own pool.  The first write host
+                # (or just host) is the primary, used for writes, transactions and schema commands.
+                if connection.driver != 'sqlite' and (connection.read or connection.write):
+                    writes = [self._host_database(connection, host) for host in (connection.write or [connection.host])]
+                    reads = [self._host_database(connection, host) for host in (connection.read or [])]
+                    self._hosts[connection.metakey] = Dict({
+                        'write': writes,
+                        'read': reads,
+                        'select': connection.select or 'round_robin',
+                        'sticky': connection.sticky if type(connection.sticky) in [int, float] else 5,
+                    })
+                    self._databases[connection.metakey] = writes[0]
+                else:
+                    self._databases[connection.metakey] = self._host_database(connection, connection.host)
+
+    def _host_database(self, connection: Connection, host: str) -> Database:
+        # Build aio_databases specific connection URL.  connection.url has a dialect
+        # in it, which we need for engines but don't need for aio_databases.
+        # Hosts may include their own :port.
+        if connection.driver == 'sqlite':
+            url = (connection.driver
+                + ':///' + connection.database
+            )
+        else:
+            if ':' not in host: host += ':' + str(connection.port)
+            url = (connection.driver
+                + '://' + connection.username
+                + ':' + connection.password
+                + '@' + host
+                + '/' + connection.database
+            )
+        return Database(url, **self._database_pool(connection))
+
+    def _dialect(self, connection: Connection) -> Any:
+        # Queries are compiled for the positional paramstyle of each aio_databases driver
+        if connection.driver == 'sqlite': return sqlite.dialect(paramstyle='qmark')
+        if connection.driver == 'mysql': return mysql.dialect(paramstyle='format')
+        if connection.driver.startswith('postgres'): return postgresql.dialect(paramstyle='numeric_dollar')
+        raise Exception('Database driver {} is not supported'.format(connection.driver))
+
+    def _engine_pool(self, connection: Connection) -> Dict:
+        # SQLAlchemy engines are only used for schema commands and sessions.  Without a
+        # pool config every use opens a new connection.  SQLite is never pooled.
+        pool = connection.pool
+        if not pool or connection.driver == 'sqlite': return {'poolclass': NullPool}
+        options = {
+            'pool_size': pool.max_size or 10,
+            'max_overflow': pool.max_overflow or 0,
+            'pool_pre_ping': bool(pool.pre_ping),
+        }
+        if pool.recycle: options['pool_recycle'] = pool.recycle
+        if pool.timeout: options['pool_timeout'] = pool.timeout
+        return options
+
+    def _database_pool(self, connection: Connection) -> Dict:
+        # Queries run on the aio_databases pool of each driver, which names its options differently.
+        # Neither driver overflows, so max_overflow is added to the max size.
+        pool = connection.pool
+        if not pool or connection.driver == 'sqlite': return {}
+        min_size = pool.min_size or 1
+        max_size = max(min_size, (pool.max_size or 10) + (pool.max_overflow or 0))
+        if connection.driver == 'mysql':
+            options = {'minsize': min_size, 'maxsize': max_size}
+            if pool.recycle: options['pool_recycle'] = pool.recycle
+            if pool.pre_ping:
+                # Reconnect connections the server closed while idle in the pool
+                async def ping(conn):
+                    await conn.ping(reconnect=True)
+                    return conn
+                options['init'] = ping
+        else:
+            # Asyncpg checks each connection itself when it is released to the pool
+            options = {'min_size': min_size, 'max_size': max_size}
+            if pool.recycle: options['max_inactive_connection_lifetime'] = pool.recycle
+        return options
+
     def packages(self, connection: str = None, metakey: str = None) -> Connection:
         if not metakey:
             if not connection: connection = self.default
@@ -166,44 +257,304 @@ class Db(DatabaseInterface):
 
         return self.databases.get(metakey)
 
+    async def warmup(self, connection: str = None, metakey: str = None) -> None:
+        """Connect and open the minimum pooled connections of one or all databases"""
+        if connection or metakey:
+            metakeys = [self.metakey(connection, metakey)]
+        else:
+            metakeys = list(self.databases.keys())
+
+        for metakey in metakeys:
+            for database in self._host_databases(metakey):
+                if not database.is_connected:
+                    await database.connect()
+
+                # Hold min_size connections at once so each is opened (and pinged) before the first request
+                pool = self._pools.get(metakey)
+                if not pool or str(database.backend) == 'sqlite': continue
+                conns = [database.backend.connection() for i in range(pool.min_size or 1)]
+                await asyncio.gather(*[self._acquire(conn, metakey) for conn in conns])
+                for conn in conns:
+                    await conn.release()
+
     async def disconnect(self, connection: str = None, metakey: str = None, from_all: bool = False) -> None:
         if from_all:
             # Disconnect from all connected databases
-            for database in self.databases.values():
+            metakeys = list(self.databases.keys())
+        else:
+            # Disconnect from one database by connection str or metakey
+            metakeys = [self.metakey(connection, metakey)]
+
+        for metakey in metakeys:
+            for database in self._host_databases(metakey):
                 # Only disconnect if connected or will throw an error
                 if database.is_connected:
                     await database.disconnect()
-        else:
-            # Disconnect from one database by connection str or metakey
-            metakey = self.metakey(connection, metakey)
-            database = self.databases.get(metakey)
-            if database.is_connected:
-                await database.disconnect()
+
+    def _host_databases(self, metakey: str) -> List[Database]:
+        # The primary and all other write and read host Databases of this metakey
+        hosts = self._hosts.get(metakey)
+        if not hosts: return [self.databases.get(metakey)]
+        return hosts.write + hosts.read
 
     async def fetchall(self, query: Union[ClauseElement, str], values: Dict = None, connection: str = None, metakey: str = None) -> List[Row]:
-        conn = await self.database(connection, metakey).connect()
-        return await conn.fetchall(query, values)
+        metakey = self.metakey(connection, metakey)
+        sql, params = self._compile(query, values, metakey)
+        read = self._is_read(query)
+        async with self._pooled(metakey=metakey, read=read) as conn:
+            result = await conn.fetchall(sql, *params)
+
+        # INSERT ... RETURNING and other writes that fetch rows
+        if not read: await self._wrote(query, metakey)
+        return result
 
 
     async def fetchone(self, query: Union[ClauseElement, str], values: Dict = None, connection: str = None, metakey: str = None) -> Optional[Row]:
-        conn = await self.database(connection, metakey).connect()
-        return await conn.fetchone(query, values)
+        metakey = self.metakey(connection, metakey)
+        sql, params = self._compile(query, values, metakey)
+        read = self._is_read(query)
+        async with self._pooled(metakey=metakey, read=read) as conn:
+            result = await conn.fetchone(sql, *params)
+
+        # INSERT ... RETURNING and other writes that fetch rows
+        if not read: await self._wrote(query, metakey)
+        return result
 
 
     async def execute(self, query: Union[ClauseElement, str], values: Union[List, Dict] = None, connection: str = None, metakey: str = None) -> Any:
-        conn = await self.database(connection, metakey).connect()
-        if type(values) == dict:
-            return await conn.execute(query, values)
-        elif type(values) == list:
-            return await conn.executemany(query, values)
+        metakey = self.metakey(connection, metakey)
+        sql, params = self._compile(query, values, metakey)
+        async with self._pooled(metakey=metakey) as conn:
+            if type(values) == list:
+                result = await conn.executemany(sql, *params)
+            else:
+                result = await conn.execute(sql, *params)
+
+        # MySQL and SQLite drivers return (rowcount, lastrowid), keep returning the new PK of an insert.
+        # Postgres has no lastrowid, use RETURNING instead.
+        if type(result) == tuple and self._dialects.get(metakey).name != 'postgresql': result = result[1]
+
+        await self._wrote(query, metakey)
+        return result
+
+    @asynccontextmanager
+    async def connect(self, connection: str = None, metakey: str = None):
+        """Pin one pooled connection to this context until the end of this block
+
+        All queries on this database inside the block, including ORM and query builder
+        queries, reuse the pinned connection instead of acquiring one each.  With read
+        replicas, one replica connection is pinned as well for reads outside transaction().
+
+        async with uvicore.db.connect('app1'):
+            posts = await Post.query().get()
+        """
+        metakey = self.metakey(connection, metakey)
+        pinned = _pinned.get() or {}
+        if metakey in pinned:
+            # Already pinned by an outer block
+            yield pinned[metakey].write
+            return
+
+        async with AsyncExitStack() as stack:
+            pin = Dict({'write': None, 'read': None, 'transactions': 0})
+            pin.write = await stack.enter_async_context(self._pooled(metakey=metakey, pinned=False))
+            if metakey in self._hosts and self._hosts[metakey].read:
+                pin.read = await stack.enter_async_context(self._pooled(metakey=metakey, pinned=False, read=True))
+            token = _pinned.set({**pinned, metakey: pin})
+            try:
+                yield pin.write
+            finally:
+                _pinned.reset(token)
+
+    def pinned(self, connection: str = None, metakey: str = None) -> bool:
+        """Check if connect() or transaction() pinned a connection of this database to this context"""
+        return self.metakey(connection, metakey) in (_pinned.get() or {})
+
+    @asynccontextmanager
+    async def transaction(self, connection: str = None, metakey: str = None):
+        """Run all queries on this database inside this block in one transaction
+
+        Commits at the end of the block or rolls back on an exception.
+        Nested transactions are savepoints of the outer one.
+
+        async with uvicore.db.transaction('app1'):
+            await post.save()
+            await post.link('tags', tags)
+        """
+        written = _written.get()
+        token = _written.set(set()) if written is None else None
+        try:
+            async with self.connect(connection, metakey) as conn:
+                # Reads inside a transaction must see its writes, so all go to the pinned primary
+                pin = _pinned.get()[self.metakey(connection, metakey)]
+                pin.transactions += 1
+                try:
+                    async with conn.transaction():
+                        yield conn
+                finally:
+                    pin.transactions -= 1
+
+            # Committed.  Invalidate the written tables again in case they were cached before the commit.
+            if token is not None:
+                for (metakey, table) in _written.get():
+                    await self.invalidate(table, metakey=metakey)
+        finally:
+            if token is not None: _written.reset(token)
+
+    async def invalidate(self, tables: Union[str, List[str]], connection: str = None, metakey: str = None) -> None:
+        """Invalidate all cached query results that read these tables"""
+        if type(tables) != list: tables = [tables]
+        if not tables: return
+        await tags.invalidate(self.metakey(connection, metakey), tables)
+
+
+    async def iterate(self, query: Union[ClauseElement, str], values: Dict = None, connection: str = None, metakey: str = None) -> AsyncGenerator[Row, None]:
+        # Stream rows from the cursor on a dedicated pooled connection.  Never the current context
+        # connection, as other queries (like *Many relations per chunk) run while the cursor is open.
+        metakey = self.metakey(connection, metakey)
+        sql, params = self._compile(query, values, metakey)
+        async with self._pooled(metakey=metakey, pinned=False, read=self._is_read(query)) as conn:
+            if conn.backend.name == 'aiomysql':
+                # aio_databases iterates MySQL with a buffered cursor that reads the entire result
+                # into memory first.  An unbuffered SSCursor reads rows from the server as we go.
+                async for row in self._iterate_unbuffered(conn, sql, params):
+                    yield row
+            else:
+                # Asyncpg (server side cursor) and SQLite already read rows as we go
+                async for row in conn.iterate(sql, *params):
+                    yield row
+
+    async def _iterate_unbuffered(self, conn: Any, sql: str, params: List) -> AsyncGenerator[Record, None]:
+        import aiomysql
+        async with conn._conn.cursor(aiomysql.SSCursor) as cursor:
+            await cursor.execute(sql, tuple(params))
+            description = cursor.description
+            while True:
+                rows = await cursor.fetchmany(100)
+                if not rows: break
+                for row in rows:
+                    yield Record(row, description)
+
+    def _compile(self, query: Union[ClauseElement, str], values: Union[List, Dict], metakey: str) -> Tuple[str, List]:
+        """Compile a query to SQL for the driver of this database with positional parameters
+
+        Compiled SQL is cached by statement structure (the SQLAlchemy cache key), dialect and
+        value keys, so the same statement with other values only binds its new parameters.
+        Returns (sql, params) with params a list of one parameter list per row for executemany.
+        """
+        dialect = self._dialects.get(metakey)
+        many = type(values) == list
+        rows = values if many else [values]
+
+        # Value keys decide the columns of an INSERT or UPDATE without .values()
+        keys = tuple(rows[0].keys()) if rows and rows[0] else None
+
+        if type(query) == str:
+            # Raw SQL with :named parameters
+            key = None
+            shape = (dialect.name, query, keys)
         else:
-            return await conn.execute(query)
-
-
-    #  async def iterate(self, query: Union[ClauseElement, str], values: dict = None, connection: str = None) -> AsyncGenerator[Mapping, None]:
-    #     async with self.connection() as connection:
-    #         async for record in connection.iterate(query, values):
-    #             yield record
+            # No cache key means an expression SQLAlchemy cannot cache, compile it every time
+            key = query._generate_cache_key()
+            shape = (dialect.name, key.key, keys, many) if key is not None else None
+
+        statement = compiled.get(shape) if shape is not None else None
+        if statement is None:
+            clause = sa.text(query) if type(query) == str else query
+            statement = clause.compile(dialect=dialect, cache_key=key, column_keys=list(keys) if keys else None, for_executemany=many)
+            if shape is not None: compiled.put(shape, statement)
+
+        # Parameter values of this query, not of the query the SQL was first compiled from.
+        # IN lists render their own number of parameters on every call.
+        extracted = key.bindparams if key is not None else None
+        params = []
+        for row in rows:
+            state = statement._process_parameters_for_postcompile(
+                statement.construct_params(row or None, extracted_parameters=extracted, _no_postcompile=True)
+            )
+            params.append(list(state.positional_parameters))
+        if many: return (state.statement, params)
+        return (state.statement, params[0])
+
+    @asynccontextmanager
+    async def _pooled(self, connection: str = None, metakey: str = None, *, pinned: bool = True, read: bool = False):
+        # Use the connection pinned to this context by connect() or acquire one
+        # from the pool of this database, released when done
+        metakey = self.metakey(connection, metakey)
+        pin = (_pinned.get() or {}).get(metakey) if pinned else None
+        if pin is not None:
+            # Reads use the pinned replica connection unless inside a transaction or sticking after a write
+            if read and pin.read is not None and not pin.transactions and not self._sticking(metakey):
+                yield pin.read
+            else:
+                yield pin.write
+            return
+
+        database = self._host(metakey, read)
+        conn = database.backend.connection()
+        self._busy[database] = self._busy.get(database, 0) + 1
+        try:
+            await self._acquire(conn, metakey)
+            try:
+                yield conn
+            finally:
+                await conn.release()
+        finally:
+            self._busy[database] -= 1
+
+    def _host(self, metakey: str, read: bool = False) -> Database:
+        # Reads go to a replica unless this context wrote recently, everything else to the primary
+        hosts = self._hosts.get(metakey)
+        if not hosts: return self.databases.get(metakey)
+        role = 'read' if read and hosts.read and not self._sticking(metakey) else 'write'
+        databases = hosts[role]
+        if len(databases) == 1: return databases[0]
+
+        if hosts.select == 'least_busy':
+            # Fewest connections in use by this process
+            return min(databases, key=lambda database: self._busy.get(database, 0))
+
+        # Round robin
+        turn = self._turns.get((metakey, role), 0)
+        self._turns[(metakey, role)] = turn + 1
+        return databases[turn % len(databases)]
+
+    def _is_read(self, query: Union[ClauseElement, str]) -> bool:
+        # Only plain SELECTs may go to a replica.  INSERT ... RETURNING and SELECT ... FOR UPDATE are writes.
+        if type(query) == str: return query.lstrip()[0:6].lower() == 'select'
+        return not getattr(query, 'is_dml', False) and getattr(query, '_for_update_arg', None) is None
+
+    async def _wrote(self, query: Union[ClauseElement, str], metakey: str) -> None:
+        # Reads of this context stay on the primary until replicas caught up with this write
+        if metakey in self._hosts: self._stick(metakey)
+
+        # Cached query results of a written table are now stale.  Raw SQL strings
+        # are not parsed, use invalidate() after writing with those.
+        if tags.enabled():
+            tables = tags.tables(query)
+            await self.invalidate(tables, metakey=metakey)
+
+            # Other requests may cache the old rows again until the transaction commits
+            written = _written.get()
+            if written is not None:
+                written.update([(metakey, table) for table in tables])
+
+    def _stick(self, metakey: str) -> None:
+        # Always a new dict, as contexts copied into other tasks (each HTTP request) share the old one
+        _sticky.set({**(_sticky.get() or {}), metakey: time.monotonic()})
+
+    def _sticking(self, metakey: str) -> bool:
+        written = (_sticky.get() or {}).get(metakey)
+        return written is not None and time.monotonic() - written < self._hosts[metakey].sticky
+
+    async def _acquire(self, conn: Any, metakey: str) -> None:
+        # A full pool waits for a free connection.  Pool timeout bounds that wait.
+        timeout = (self._pools.get(metakey) or {}).get('timeout')
+        if not timeout: return await conn.acquire()
+        try:
+            await asyncio.wait_for(conn.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise Exception('Timed out after {} seconds waiting for a pooled connection to {}'.format(timeout, metakey))
 
     # async def _connect(self, connection: str = None, metakey: str = None) -> None:
     #     # Async connect to db if not connected
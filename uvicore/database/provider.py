@@ -43,6 +43,8 @@ class Db:
                     url = 'sqlite:///' + connection.database
                     metakey = url
                 elif connection.driver in ['mysql', 'postgresql']:
+                    # With write hosts and no host, the first write host is the primary
+                    if not connection.host and connection.write: connection.host = connection.write[0]
                     url = connection.driver
                     if connection.dialect: url += '+' + connection.dialect
                     url += (
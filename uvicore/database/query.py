@@ -6,10 +6,12 @@ from typing import Any, Dict, Generic, List, Tuple, TypeVar, Union
 from uvicore.support.hash import sha1
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.sql.expression import BinaryExpression
 from sqlalchemy.engine.result import RowProxy
 
 import uvicore
+from uvicore.database import tags
 from uvicore.database.builder import QueryBuilder, Join
 from uvicore.support.dumper import dd, dump
 from uvicore.contracts import DbQueryBuilder as BuilderInterface
@@ -101,10 +103,8 @@ class DbQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E]):
     async def get(self) -> List[RowProxy]:
         """Execute select query and return all rows found"""
 
-        # Build select query
-        # Use copy() insteadd of .copy() or nested tables tables get deepcopied and SA sees
-        # them as multiple tables thworing a 1066, "Not unique table/alias: 'posts'"
-        query, saquery = self._build_query('select', copy(self.query))  # do NOT use .copy()
+        # Build select query from the plan cache
+        query, saquery = self._build_planned_query('select')
 
         # Detect caching
         cache = self.query.cache
@@ -112,7 +112,8 @@ class DbQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E]):
             prefix = 'uvicore.database/'
             if cache.get('key') is None:
                 # No cache name specified, automatically build unique based on queries
-                cache['key'] = prefix + query.hash(
+                # Hash our own query as a planned query only holds bind parameter names
+                cache['key'] = prefix + self.query.hash(
                     hash_type='sha1',
                     package='uvicore.database',
                     connection=self._conn,
@@ -120,25 +121,60 @@ class DbQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E]):
             else:
                 cache['key'] = prefix + cache.get('key')
 
-        if cache and await uvicore.cache.has(cache.get('key')):
-            # Cache found, use cached results
-            #dump('DB FROM CACHE')
-            results = await uvicore.cache.get(cache.get('key'))
-        else:
-            # Execute query
-            #dump('DB FROM DB')
-            results = await uvicore.db.fetchall(saquery, connection=self._connection())
-
-            # Add to cache if desired
-            if cache: await uvicore.cache.put(cache.get('key'), results, seconds=cache.get('seconds'))
-
-        return results
+        async def fetch():
+            return await uvicore.db.fetchall(saquery, connection=self._connection())
+
+        # No caching, execute query
+        if not cache: return await fetch()
+
+        # Cached results are only used if none of their tables were written since.
+        # Concurrent callers of the same missing key share one query.
+        key = tags.versioned(cache.get('key'), await self._cache_versions(self.query))
+        return await uvicore.cache.remember(key, fetch, seconds=cache.get('seconds'), stale=cache.get('stale'))
+
+    async def upsert(self, rows: List[Dict], conflict: List[str] = None, update: List[str] = None, *, chunk_size: int = None) -> None:
+        """Insert rows, updating the existing row on a unique key conflict
+
+        Conflict defaults to the primary key and update to every other column of the rows.
+        Compiles to INSERT ... ON CONFLICT DO UPDATE (SQLite, Postgres) or ON DUPLICATE KEY UPDATE (MySQL)
+        and runs in multi-row statements of chunk_size rows.
+        """
+        if type(rows) != list: rows = [rows]
+        if not rows: return
+        table = self.query.table
+        if table is None: raise Exception('Upsert requires a table.  Use .table() first.')
+
+        conflict = conflict or [self._pk()]
+        if update is None: update = [column for column in rows[0].keys() if column not in conflict]
+        chunk_size = chunk_size or uvicore.config.app.database.upsert_chunk_size or 1000
+
+        for i in range(0, len(rows), chunk_size):
+            saquery = self._build_upsert(table, rows[i:i + chunk_size], conflict, update)
+            await uvicore.db.execute(saquery, connection=self._connection())
+
+    def _build_upsert(self, table: sa.Table, rows: List[Dict], conflict: List[str], update: List[str], driver: str = None):
+        # Driver of this query's connection unless given
+        driver = driver or str(uvicore.db.connection(self._connection()).driver)
+        if driver == 'mysql':
+            # MySQL conflicts on any unique key, conflict columns are not part of the statement
+            saquery = mysql.insert(table).values(rows)
+            if not update: update = conflict[0:1]
+            return saquery.on_duplicate_key_update({column: saquery.inserted[column] for column in update})
+        elif driver == 'sqlite' or driver.startswith('postgres'):
+            dialect = sqlite if driver == 'sqlite' else postgresql
+            saquery = dialect.insert(table).values(rows)
+            if not update: return saquery.on_conflict_do_nothing(index_elements=conflict)
+            return saquery.on_conflict_do_update(
+                index_elements=conflict,
+                set_={column: saquery.excluded[column] for column in update},
+            )
+        raise Exception('Upsert is not supported for database driver {}'.format(driver))
 
     async def delete(self) -> None:
         """Execute delete query"""
 
         # Build SQLAlchemy delete query
-        query, saquery = self._build_query('delete', copy(self.query))
+        query, saquery = self._build_planned_query('delete')
 
         # Execute query
         await uvicore.db.execute(saquery, connection=self._connection())
@@ -147,7 +183,7 @@ class DbQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E]):
         """Execute update query"""
 
         # Build SQLAlchemy delete query
-        query, saquery = self._build_query('update', copy(self.query))
+        query, saquery = self._build_planned_query('update')
 
         # Add in values
         saquery = saquery.values(**kwargs)
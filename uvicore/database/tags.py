@@ -0,0 +1,47 @@
+import uvicore
+from sqlalchemy.sql import ClauseElement
+from uvicore.typing import Any, Dict, List, Optional, Tuple, Union
+from uvicore.support.dumper import dump, dd
+
+
+# Cached query results are keyed by the version of every table they read.  Writing to a table
+# bumps its version so every cached result of that table is a miss from then on and simply
+# expires with its own TTL.  No list of cached keys per table is ever kept.
+prefix = 'uvicore.database/tags/'
+
+
+def enabled() -> bool:
+    """Writes invalidate cached results unless database.cache_invalidation is False"""
+    return uvicore.config.app.database.cache_invalidation is not False
+
+
+def _key(metakey: str, table: str) -> str:
+    return prefix + metakey + '/' + table
+
+
+async def versions(metakey: str, tables: List[str]) -> Dict[str, int]:
+    """Get the current version of each table"""
+    if not tables: return {}
+    keys = [_key(metakey, table) for table in tables]
+    values = await uvicore.cache.get(keys)
+    return {table: int(values.get(key) or 0) for (table, key) in zip(tables, keys)}
+
+
+async def invalidate(metakey: str, tables: List[str]) -> None:
+    """Bump the version of each table, invalidating every cached result that read them"""
+    for table in dict.fromkeys(tables):
+        # Versions never expire, an expired version would start over and match old results
+        await uvicore.cache.increment(_key(metakey, table), seconds=0)
+
+
+def versioned(key: str, current: Dict[str, int]) -> str:
+    """Cache key of a result read at these table versions.  Results of older versions are never read again."""
+    return key + '@' + '.'.join([str(version) for version in current.values()])
+
+
+def tables(query: Union[ClauseElement, str]) -> List[str]:
+    """Tables written by an INSERT, UPDATE or DELETE statement"""
+    table = getattr(query, 'table', None)
+    name = getattr(table, 'name', None)
+    if not getattr(query, 'is_dml', False) or name is None: return []
+    return [name]
@@ -64,6 +64,9 @@ class Dispatcher(DispatcherInterface):
         self._listeners: Dict[str, List] = Dict()
         self._wildcards: List = []
 
+        # Event name to has listeners bool, cleared when a listener is added
+        self._has_listeners: Dict[str, bool] = {}
+
     @property
     def registered_events(self) -> List:
         """Get all registered events from IOC bindings and manual registrations"""
@@ -144,6 +147,15 @@ class Dispatcher(DispatcherInterface):
         # Return these event handlers
         return handlers
 
+    def has_listeners(self, event: Union[str, Callable]) -> bool:
+        """Check if an event has any listeners including wildcards, cached until the next listen()"""
+        if type(event) != str: event = event.name
+        found = self._has_listeners.get(event)
+        if found is None:
+            found = bool(self.listeners.get(event)) or any([re.search(wildcard, event) for wildcard in self.wildcards])
+            self._has_listeners[event] = found
+        return found
+
     def listen(self, events: Union[str, List], listener: Union[str, Callable] = None, *, priority: int = 50) -> None:
         """Decorator or method to append a listener (string or Callable) callback to one or more events."""
         def handle(events, listener):
@@ -161,6 +173,9 @@ class Dispatcher(DispatcherInterface):
                 # Append new listener to event
                 self._listeners[event].append({'listener': listener, 'priority': priority})
 
+                # Any cached has_listeners() result may be matched by this event or wildcard
+                self._has_listeners.clear()
+
                 # If event contains a *, add it to our wildcard list for use later
                 if '*' in event:
                     self._wildcards.append(event)
@@ -218,7 +233,7 @@ class Dispatcher(DispatcherInterface):
 
     async def _dispatch_async(self, event: Union[str, Callable], payload: Dict = {}) -> None:
         """Dispatch an event by fireing off all listeners/handlers"""
-        (payload, handlers) = self._get_handlers(event, payload)
+        (event, handlers) = self._get_handlers(event, payload)
         for handler in handlers:
             if asyncio.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(handler.__call__):
                 await handler(event)
@@ -237,7 +252,7 @@ class Dispatcher(DispatcherInterface):
             if '-' in event or '{' in event:
                 # String event (we know because classes can't have dashes or {.
                 # This is how we name dynamic string based events like per model or table...
-                method = self._dispatch_async if is_async else self.dispatch
+                method = self._dispatch_async if is_async else self._dispatch
             else:
                 # See if string event has a matching class.  If so, import and dispatch it
                 try:
@@ -1,5 +1,7 @@
 # Uvicore custom
 from .authentication import Authentication
+from .identity_map import IdentityMap
+from .database import DatabaseConnection
 
 # Starlette passthrough via class proxy
 from starlette.middleware.base import BaseHTTPMiddleware as _Base
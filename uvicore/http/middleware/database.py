@@ -0,0 +1,37 @@
+import uvicore
+from contextlib import AsyncExitStack
+from uvicore.typing import ASGIApp, List, Send, Receive, Scope
+from uvicore.support.dumper import dump, dd
+
+
+@uvicore.service()
+class DatabaseConnection:
+    """Database connection global middleware
+
+    Each request pins one pooled connection per database so all of its queries reuse
+    it instead of acquiring a connection each.  Databases with read replicas also pin
+    a replica connection for reads.  With transaction, every request runs in one
+    transaction that commits when the response is sent or rolls back on error, and
+    all of its queries use the primary.
+    """
+
+    def __init__(self, app: ASGIApp, connections: List[str] = None, transaction: bool = False) -> None:
+        self.app = app
+        self.connections = connections
+        self.transaction = transaction
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Middleware only for http and websocket types
+        if scope["type"] not in ["http", "websocket"]:
+            # Next middleware in stack
+            await self.app(scope, receive, send)
+            return
+
+        # Connections live only as long as this request.  Defaults to the default connection.
+        async with AsyncExitStack() as stack:
+            for connection in self.connections or [uvicore.db.default]:
+                if self.transaction:
+                    await stack.enter_async_context(uvicore.db.transaction(connection))
+                else:
+                    await stack.enter_async_context(uvicore.db.connect(connection))
+            await self.app(scope, receive, send)
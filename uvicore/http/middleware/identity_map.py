@@ -0,0 +1,27 @@
+import uvicore
+from uvicore.typing import ASGIApp, Send, Receive, Scope
+from uvicore.orm.identity import identity_scope
+from uvicore.support.dumper import dump, dd
+
+
+@uvicore.service()
+class IdentityMap:
+    """ORM identity map global middleware
+
+    Each request gets its own identity map so all ORM queries of that request share
+    one model instance per entity and primary key instead of hydrating it again.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Middleware only for http and websocket types
+        if scope["type"] not in ["http", "websocket"]:
+            # Next middleware in stack
+            await self.app(scope, receive, send)
+            return
+
+        # Identity map lives only as long as this request
+        with identity_scope():
+            await self.app(scope, receive, send)
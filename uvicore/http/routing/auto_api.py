@@ -13,6 +13,7 @@ from uvicore.support.dumper import dump, dd
 from uvicore.http.exceptions import PermissionDenied
 from uvicore.contracts import UserInfo
 from uvicore.http.exceptions import BadParameter
+from starlette.responses import Response
 
 E = TypeVar("E")
 
@@ -20,6 +21,9 @@ E = TypeVar("E")
 page_size_default = uvicore.config.app.api.page_size or 25
 page_size_max = uvicore.config.app.api.page_size_max or 100
 
+# Seconds to cache the total count of a list query
+count_cache_seconds = uvicore.config.app.api.count_cache_seconds or 60
+
 
 @uvicore.service()
 class AutoApi(Generic[E], AutoApiInterface[E]):
@@ -28,7 +32,9 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         scopes: List = [],
         *,
         request: Request,
+        response: Response = None,
         include: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
         find: Optional[str] = None,
         where: Optional[str] = None,
         or_where: Optional[str] = None,
@@ -38,15 +44,21 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         sort: Optional[str] = None,
         page: Optional[int] = 1,
         page_size: Optional[int] = page_size_default,
+        cursor: Optional[str] = None,
+        total: Optional[bool] = False,
     ):
         self.Model = Model
         self.scopes = scopes
         self.request = request
+        self.response = response
         self.user: UserInfo = request.user
         self.includes = self._build_include(include)
+        self.fields = self._build_fields(fields)
         self.find = self._build_find(find)
         self.page = page
         self.page_size = page_size
+        self.cursor = cursor
+        self.total = total
         if self.page_size > page_size_max: self.page_size = page_size_max
 
         # Where and filter JSON look identical, as does the ORM, all considered "whereables"
@@ -64,6 +76,7 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         request: Request,
         id: Union[str, int],
         include: Optional[List[str]] = Query([]),
+        fields: Optional[List[str]] = Query([]),
         filter: Optional[str] = '',
         or_filter: Optional[str] = '',
     ):
@@ -73,7 +86,9 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
     @classmethod
     def getsig(
         request: Request,
+        response: Response,
         include: Optional[List[str]] = Query([]),
+        fields: Optional[List[str]] = Query([]),
         find: Optional[str] = '',
         where: Optional[str] = '',
         or_where: Optional[str] = '',
@@ -83,6 +98,8 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         sort: Optional[str] = '',
         page: Optional[int] = 1,
         page_size: Optional[int] = page_size_default,
+        cursor: Optional[str] = None,
+        total: Optional[bool] = False,
     ):
         """AutoApi Get Function Signature"""
         pass
@@ -97,6 +114,9 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         # Include
         if self.includes: query.include(*self.includes)
 
+        # Select only these fields (partial models)
+        if self.fields: query.select(*self.fields)
+
         # Where
         if self.wheres: query.where(self.wheres)
 
@@ -115,14 +135,30 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         # Sort (children)
         if self.sorts: query.sort(self.sorts)
 
-        # Page and Page Size (ORM limit and offset)
-        query.limit(self.page_size).offset(self.page_size * (self.page - 1))
+        # Page and Page Size
+        if self.cursor is not None:
+            # Keyset pagination only when asked for with ?cursor=, an empty cursor is the first page.
+            # Seeks past the last row of the previous page (ORM after and limit).
+            if not self._keyset_orderable():
+                raise BadParameter('Cursor pagination can only order_by fields of this model, not relations', extra={'params': self.cursor})
+            try:
+                query.after(self.cursor).limit(self.page_size)
+            except Exception as e:
+                raise BadParameter('Invalid cursor parameter', exception=str(e), extra={'params': self.cursor})
+        else:
+            # Offset pagination (ORM limit and offset)
+            query.limit(self.page_size).offset(self.page_size * (self.page - 1))
 
         #query.key_by('id')
 
         # Return unfinished, still chainable query builder
         return query
 
+    async def total_count(self) -> int:
+        """Total count of rows across all pages, cached for api.count_cache_seconds"""
+        # Count ignores limit, offset and order so every page shares one cached count
+        return await self.orm_query().cache(seconds=count_cache_seconds).count()
+
     def guard_relations(self):
         # No includes, skip
         if not self.includes: return self
@@ -213,6 +249,18 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
                 results.append(include)
         return results
 
+    def _build_fields(self, fields: List):
+        fields = self._build_include(fields)
+        if not fields: return
+
+        # Relations of dotted fields are included so guard_relations() can check them
+        for field in fields:
+            if '.' not in field: continue
+            include = '.'.join(field.split('.')[0:-1])
+            if self.includes is None: self.includes = []
+            if include not in self.includes: self.includes.append(include)
+        return fields
+
     def _build_find(self, find_str: str) -> Dict:
         if not find_str: return None
         try:
@@ -245,6 +293,13 @@ class AutoApi(Generic[E], AutoApiInterface[E]):
         except Exception as e:
             raise BadParameter('Invalid where/or_where/filter/or_filter parameter, possibly invalid JSON?', exception=str(e), extra={'params': where_str})
 
+    def _keyset_orderable(self) -> bool:
+        # Keyset pagination can only seek on fields of the main model, not relations
+        for order_by in self.order_bys or []:
+            field = order_by[0] if type(order_by) in (tuple, list) else order_by
+            if type(field) != str or '.' in field: return False
+        return True
+
     def _build_sortable(self, order_by_str: str) -> List[Tuple]:
         if not order_by_str: return None
         orm_order_bys = []
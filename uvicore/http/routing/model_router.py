@@ -19,6 +19,7 @@ from pydantic import BaseModel as PydanticModel
 from pydantic import BaseModel
 
 from starlette.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 
 # -where
 # -or_where
@@ -87,6 +88,22 @@ class ModelRoutes:
                     results = await query.find(**api.find)
                 else:
                     results = await query.get()
+
+                    # Keyset pagination cursor to fetch the next page with ?cursor=
+                    if query.next_cursor and api.response is not None:
+                        api.response.headers['X-Next-Cursor'] = query.next_cursor
+
+                    # Optional total count of all pages with ?total=true
+                    if api.total and api.response is not None:
+                        api.response.headers['X-Total-Count'] = str(await api.total_count())
+
+                # Partial models with ?fields= would fail the response_model validation.
+                # Return only the selected fields as JSON, keeping the X- headers set above
+                if api.fields:
+                    headers = {}
+                    if api.response is not None:
+                        headers = {key: value for key, value in api.response.headers.items() if key.startswith('x-')}
+                    return JSONResponse(content=jsonable_encoder(results, exclude_unset=True), headers=headers)
                 return results
             except Exception as e:
                 raise HTTPException(
@@ -122,6 +139,8 @@ class ModelRoutes:
                 raise HTTPException(500, str("Error in query builder, most likely an unknown column or query parameter."))
 
             if results:
+                # Partial model with ?fields= returns only the selected fields
+                if api.fields: return JSONResponse(content=jsonable_encoder(results, exclude_unset=True))
                 return results
             else:
                 #raise NotFound()
@@ -193,9 +212,10 @@ class ModelRoutes:
                     items = [items]
                     is_single = True
 
-                for item in items:
-                    pk = await Model.insert_with_relations(item.copy())
+                # Insert each level of all items relation trees in multi-row statements
+                pks = await Model.insert_with_relations([item.copy() for item in items], batch=True)
 
+                for (item, pk) in zip(items, pks):
                     # If primary key is read_only, assume its an auto-incrementing pk
                     # If not read_only, its a manual pk like 'key'.
                     # Only set new pk result if pk is read_only.  Why? Because when pk is 'key'
@@ -273,6 +273,10 @@ class Logger(LoggerInterface):
 
         self.config = config
 
+        # Cache of enabled() results by (name, level).  Handlers and their filters
+        # never change after init so this only needs to be computed once.
+        self._enabled = {}
+
     def __call__(self, message):
         self.info(message)
 
@@ -302,6 +306,23 @@ class Logger(LoggerInterface):
     def reset(self):
         self._name = None
 
+    def enabled(self, level: str = 'INFO') -> bool:
+        """Check if a message at this level for the current name would be output by any handler
+
+        Use as a guard to skip building expensive log messages and dumps entirely.
+        """
+        name = self._name or 'root'
+        levelno = logging.getLevelName(level.upper())
+        if (name, levelno) not in self._enabled:
+            record = logging.LogRecord(name, levelno, '', 0, '', None, None)
+            self._enabled[(name, levelno)] = any(
+                levelno >= handler.level and handler.filter(record)
+                for handler in self._logger.handlers
+            )
+        enabled = self._enabled[(name, levelno)] and self.logger.isEnabledFor(levelno)
+        self.reset()
+        return enabled
+
     def dump(self, *args):
         self._dump_handler(*args, handler='file', filters=self.config['file']['filters'], excludes=self.config['file']['exclude'])
         self._dump_handler(*args, handler='console', filters=self.config['console']['filters'], excludes=self.config['console']['exclude'])
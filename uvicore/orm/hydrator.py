@@ -0,0 +1,123 @@
+import copy
+import uvicore
+from typing import Any, Callable, Dict, List, Tuple
+from uvicore.database.builder import PlanCache
+from uvicore.orm.identity import identity_map
+from uvicore.support.dumper import dump, dd
+
+
+def snapshot(values: Dict) -> Dict:
+    """Copy of field values to compare against later, mutable values (JSON) are deep copied
+    so changing them in place is still detected"""
+    return {name: (copy.deepcopy(value) if type(value) in (dict, list, set) else value) for (name, value) in values.items()}
+
+
+@uvicore.service()
+class Hydrator:
+    """Row to model converter compiled once per entity, prefix and row shape
+
+    All field to row lookups are resolved when compiled.  Converting a row is then only
+    a walk of (field, position) pairs with no per row field inspection or string building.
+    """
+
+    def __init__(self, entity, keys: Tuple, prefix: str = None, *, only: List = None, trusted: bool = False, positional: bool = True):
+        self.entity = entity
+        self.only = only
+        self.trusted = trusted
+
+        # Row keys to position, or just the keys themselves for dictionary rows
+        index = {key: (i if positional else key) for i, key in enumerate(keys)}
+
+        # Each column field as (field name, row position)
+        self.columns: List[Tuple[str, Any]] = []
+
+        # Row position of the primary key, or None if not in this row
+        self.pk = None
+
+        # Each evaluate field as (field name, method, args, kwargs)
+        self.evaluates: List[Tuple[str, Callable, Tuple, Dict]] = []
+
+        for field in entity.modelfields.values():
+            if not field.column and not field.evaluate: continue
+            if only is not None and field.name not in only: continue
+
+            if field.evaluate:
+                if type(field.evaluate) == dict:
+                    # Evaluate is a Dict with callback and named parameters.  Copy all but the method
+                    # so the fields evaluate Dict is never modified
+                    kwargs = {key: value for key, value in field.evaluate.items() if key != 'method'}
+                    self.evaluates.append((field.name, field.evaluate['method'], (), kwargs))
+                elif type(field.evaluate) == tuple:
+                    # Evaluate is a Tuple with callback and parameters
+                    self.evaluates.append((field.name, field.evaluate[0], tuple(field.evaluate[1:]), {}))
+                else:
+                    # Evaluate is a callback
+                    self.evaluates.append((field.name, field.evaluate, (), {}))
+            else:
+                column = prefix + '__' + field.column if prefix else field.column
+                if column in index: self.columns.append((field.name, index[column]))
+                if column in index and field.name == entity.pk: self.pk = index[column]
+
+        # Fields not found in this row.  Partial models set them all to None.  Trusted models only
+        # set the required ones to None and let pydantic fill in the defaults of the rest
+        found = [x[0] for x in self.columns] + [x[0] for x in self.evaluates]
+        if only is not None:
+            self.missing = {name: None for name in entity.modelfields.keys() if name not in found}
+        else:
+            self.missing = {name: None for (name, field) in entity.__fields__.items() if field.required and name not in found}
+
+        # Partial models only compute the selected callbacks
+        self.callbacks = [(key, callback) for (key, callback) in entity.__callbacks__.items() if only is None or key in only]
+
+    def __call__(self, row: Any) -> Any:
+        """Convert a single table row into a model instance"""
+        fields = {name: row[position] for (name, position) in self.columns}
+        for (name, method, args, kwargs) in self.evaluates:
+            fields[name] = method(row, *args, **kwargs)
+
+        if self.only is None and not self.trusted:
+            # Full pydantic validation
+            model = self.entity(**fields)
+        else:
+            # Partial or trusted model, skip validation.  Only the fields found are marked as set
+            model = self.entity.construct(_fields_set=set(fields.keys()), **self.missing, **fields)
+            for (key, callback) in self.callbacks:
+                setattr(model, key, callback(model))
+
+        # Values as loaded so save() only writes changed columns
+        model._persisted = snapshot(fields)
+        return model
+
+    def load(self, row: Any, shared: bool = True) -> Any:
+        """Convert a single table row into a model, reusing the instance in the identity map if active
+
+        Not shared models are always converted fresh and never added to the identity map.
+        """
+        models = identity_map()
+
+        # Partial models are never shared as other queries expect all fields
+        if not shared or models is None or self.only is not None or self.pk is None: return self(row)
+
+        pk_value = row[self.pk]
+        if pk_value is None: return self(row)
+        if self.entity not in models: models[self.entity] = {}
+        model = models[self.entity].get(pk_value)
+        if model is None:
+            model = models[self.entity][pk_value] = self(row)
+        return model
+
+
+# Compiled hydrators are bounded like query plans as each row shape compiles its own
+hydrators = PlanCache()
+
+
+def hydrator(entity, row: Any, prefix: str = None, *, only: List = None, trusted: bool = False) -> Hydrator:
+    """Get the compiled hydrator for rows shaped like this row"""
+    positional = not isinstance(row, dict)
+    keys = tuple(row.keys())
+    key = (entity, keys, prefix, tuple(only) if only is not None else None, trusted, positional)
+    compiled = hydrators.get(key)
+    if compiled is None:
+        compiled = Hydrator(entity, keys, prefix, only=only, trusted=trusted, positional=positional)
+        hydrators.put(key, compiled)
+    return compiled
@@ -0,0 +1,48 @@
+import uvicore
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from uvicore.support.dumper import dump, dd
+
+
+# Identity map of the current context (usually one HTTP request) as {entity: {pk: model}}.
+# None means no identity map is active and every query hydrates its own models.
+_identity_map: ContextVar[Optional[Dict]] = ContextVar('uvicore.orm.identity_map', default=None)
+
+
+def identity_map() -> Optional[Dict]:
+    """Get the identity map of the current context, or None if not active"""
+    return _identity_map.get()
+
+
+@contextmanager
+def identity_scope() -> Iterator[Dict]:
+    """Activate a fresh identity map until the end of this block
+
+    with identity_scope():
+        user = await User.query().find(1)
+        same = await User.query().find(1)  # Same instance, not re-hydrated
+    """
+    token = _identity_map.set({})
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
+
+
+def remember(entity, pk_value: Any, model: Any) -> None:
+    """Add a model to the current identity map"""
+    models = _identity_map.get()
+    if models is None or pk_value is None: return
+    if entity not in models: models[entity] = {}
+    models[entity][pk_value] = model
+
+
+def forget(entity, pk_value: Any = None) -> None:
+    """Remove one model, or all models of this entity if no pk_value, from the current identity map"""
+    models = _identity_map.get()
+    if not models or entity not in models: return
+    if pk_value is None:
+        del models[entity]
+    else:
+        models[entity].pop(pk_value, None)
@@ -1,8 +1,10 @@
 import uvicore
 import inspect
+from typing import List, Mapping
 from uvicore.support.dumper import dump, dd
 from uvicore.contracts import Mapper as MapperInterface
 from uvicore.support.collection import haskey, getvalue
+from uvicore.orm.hydrator import hydrator
 from sqlalchemy.engine.result import RowProxy
 
 
@@ -42,7 +44,7 @@ class Mapper(MapperInterface):
                 return field.name
         return column
 
-    def model(self, perform_mapping: bool = True):
+    def model(self, perform_mapping: bool = True, only: List = None, trusted: bool = False):
         """Convert a dict or List[dict] into a model or List[Model]
 
         Only maps table->model fields if perform_mapping = True, else assume already model fields.
@@ -50,6 +52,8 @@ class Mapper(MapperInterface):
         Works on a list of dict - entity.mapper(ListOfDictModel).model()
         Passes through if already a Model or List[Model]
         If mixed List of Dict and Model, converts all to Models
+        If only is a List of field names, rows convert to partial models of just those fields
+        If trusted, rows from our own database convert to models without pydantic validation
         """
 
         if self.args:
@@ -66,18 +70,19 @@ class Mapper(MapperInterface):
 
         models = []
         for value in values:
-            if type(value) == RowProxy:
-                # Convert SQLAlchemy row to model
-                models.append(self._row_to_model(value))
-
-            elif type(value) == dict:
+            if type(value) == dict:
                 # Convert dict to actual Model instance
                 if perform_mapping:
                     # Values table columns need mapped to model fields
-                    models.append(self._row_to_model(value))
+                    models.append(self._row_to_model(value, only))
                 else:
                     # Assume values are already in model fields
                     models.append(self.entity(**value))
+
+            elif type(value) == RowProxy or isinstance(value, Mapping):
+                # Convert SQLAlchemy row or database record to model
+                models.append(self._row_to_model(value, only, trusted))
+
             else:
                 # Already a model instance
                 models.append(value)
@@ -138,45 +143,20 @@ class Mapper(MapperInterface):
         #         columns[field.column] = value
         # return columns
 
-    def _row_to_model(self, row = None):
+    def _row_to_model(self, row = None, only: List = None, trusted: bool = False):
         """Convert a single table row (SQLAlchemy RowProxy) or DICT of table into a model instance"""
         if not row: row = self.args[0]
         prefix = None
         if len(self.args) == 2: prefix = self.args[1]
-        fields = {}
-
-        for field in self.instance.__modelfields__.values():
-            if not field.column and not field.evaluate: continue
-
-            # NO, because we added an override of show_writeonly() on query builder
-            # So this is handled in metaclass.py selectable_columns instead
-            # NO if field.write_only: continue
 
-            if field.evaluate:
-                if type(field.evaluate) == dict:
-                    # Evaluate is a Dict with callback and named parameters
-                    eval_method = field.evaluate['method']
-                    del field.evaluate['method']
-                    #dump('tuple here', field.evaluate)
-                    fields[field.name] = eval_method(row, **field.evaluate)
+        # NO write_only check, because we added an override of show_writeonly() on query builder
+        # So this is handled in metaclass.py selectable_columns instead
 
-                elif type(field.evaluate) == tuple:
-                    # Evaluate is a Tuple with callback and parameters
-                    eval_method = field.evaluate[0]
-                    fields[field.name] = eval_method(row, *field.evaluate[1:])
-
-                else:
-                    # Evaluate is a callback
-                    fields[field.name] = field.evaluate(row)
-
-            else:
-                column = field.column
-                if prefix: column = prefix + '__' + column
-                # Use haskey instead of hasattr because data could be an SQLAlchemy row (which is class notation)
-                # or a dictionary.  haskey and getvalue work the same on class models or dictionaries!
-                if haskey(row, column):
-                    fields[field.name] = getvalue(row, column)
-        return self.entity(**fields)
+        # Field to column lookups are compiled once per entity, prefix and row shape.
+        # Plain dicts are not database records so they never come from the identity map.
+        compiled = hydrator(self.entity, row, prefix, only=only, trusted=trusted)
+        if type(row) == dict: return compiled(row)
+        return compiled.load(row)
 
 
 
@@ -4,7 +4,7 @@ from uvicore.support.dumper import dd, dump
 from prettyprinter import pretty_call, register_pretty
 from pydantic.fields import FieldInfo as PydanticFieldInfo
 from pydantic.main import ModelMetaclass as PydanticMetaclass
-from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Tuple, Union
 
 import sqlalchemy as sa
 from sqlalchemy.sql import ClauseElement
@@ -135,6 +135,11 @@ class ModelMetaclass(PydanticMetaclass):
         """Database fetchall in the context of this entities connection"""
         return await uvicore.db.fetchall(query=query, connection=entity.__connection__)
 
+    async def iterate(entity, query: Union[ClauseElement, str], values: Dict = None) -> AsyncGenerator[Mapping, None]:
+        """Database iterate in the context of this entities connection"""
+        async for row in uvicore.db.iterate(query=query, values=values, connection=entity.__connection__):
+            yield row
+
     # def to_model(entity, row, prefix: str = None) -> Any:
     #     """Convert a row of table data into a model"""
     #     fields = {}
@@ -152,12 +157,13 @@ class ModelMetaclass(PydanticMetaclass):
     #     if field: return field.column
     #     return fieldname
 
-    def selectable_columns(entity, table: sa.Table = None, *, show_writeonly: Union[bool, List] = False) -> List[sa.Column]:
+    def selectable_columns(entity, table: sa.Table = None, *, show_writeonly: Union[bool, List] = False, fields: List = None) -> List[sa.Column]:
         """Get all SQLA columns that are selectable
 
         Why not just use the table to get all columns?  Because a table
         may have far more columns than the actual model.  So we use the model
         to infer a list of actual SQLA columns (excluding write_only fields)
+        If fields is a List of field names, only those columns are selectable
         """
         if table is None: table = entity.table
 
@@ -167,6 +173,9 @@ class ModelMetaclass(PydanticMetaclass):
         all_columns = table.columns
         columns: List[sa.Column] = []
         for (field_name, field) in entity.modelfields.items():
+            # Exclude fields not in a partial projection
+            if fields is not None and field_name not in fields: continue
+
             # Exclude None columns (which are relations) and write_only columns which cannot be viewed
             if field.column:
                 show = False
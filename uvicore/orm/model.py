@@ -1,14 +1,17 @@
 from __future__ import annotations
+import re
 import uvicore
 import sqlalchemy as sa
 from uvicore.orm.mapper import Mapper
-from pydantic import main as PydanticMain
+from uvicore.orm import identity
+from pydantic import main as PydanticMain, PrivateAttr
 from uvicore.support.dumper import dd, dump
 from uvicore.orm.query import OrmQueryBuilder
+from uvicore.orm.hydrator import snapshot
 from uvicore.support.classes import hybridmethod
 from uvicore.contracts import Model as ModelInterface
 from uvicore.support.collection import getvalue, setvalue
-from uvicore.typing import Any, Dict, Generic, List, Tuple, TypeVar, Union
+from uvicore.typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
 from uvicore.orm.fields import BelongsTo, BelongsToMany, Field, HasMany, HasOne, MorphMany, MorphOne, MorphToMany
 
 E = TypeVar("E")
@@ -43,12 +46,14 @@ PydanticBaseModel = PydanticMain.BaseModel
 #   query
 #   insert
 #   insert_with_relations
+#   upsert
 #   mapper
 #   create
 #   save
 #   delete
 #   link
 #   unlink
+#   sync
 # and other items inside pydantic BaseModel (main.py) that will error itself like:
 #   dict
 #   json
@@ -58,6 +63,9 @@ PydanticBaseModel = PydanticMain.BaseModel
 @uvicore.service()
 class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
 
+    # Field values as loaded from or saved to the database, None for new models
+    _persisted: Optional[Dict] = PrivateAttr(None)
+
     def __init__(self, **data: Any) -> None:
         # Call pydantic parent
         super().__init__(**data)
@@ -102,12 +110,9 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         # insert twice.  So we are assuming these are all new records therefore we CAN
         # fire the _before_insert hooks
 
-        # Loop each model and call the before_save hook
+        # Fire the before hooks of each model and the batch BeforeInsertMany and BeforeSaveMany events
         if type(models) == list:
-            for model in models:
-                # Fire model hooks
-                await model._before_insert()
-                await model._before_save()
+            await entity._fire_hooks(['BeforeInsert', 'BeforeSave'], models)
         else:
             await models._before_insert()
             await models._before_save()
@@ -128,11 +133,9 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
             #except:
                 #pass
 
-        # Loop each model and call the after_save hook
+        # Fire the after hooks of each model and the batch AfterInsertMany and AfterSaveMany events
         if type(models) == list:
-            for model in models:
-                await model._after_insert()
-                await model._after_save()
+            await entity._fire_hooks(['AfterInsert', 'AfterSave'], models)
         else:
             await models._after_insert()
             await models._after_save()
@@ -141,14 +144,49 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         return result
 
     @classmethod
-    async def insert_with_relations(entity, models: List[Dict], *, parent_pk = None, skip_save: bool = False) -> None:
+    async def upsert(entity, models: Union[E, Dict, List[E], List[Dict]], conflict: List[str] = None, update: List[str] = None) -> None:
+        """Insert one or more entities, updating the existing record on a unique key conflict
+
+        Conflict and update are model field names.  Conflict defaults to the primary key
+        and update to every other field.  Runs as chunked multi-row statements without
+        a SELECT per record.  Like insert(), relations are not upserted.
+        """
+
+        # Convert any type of dict or list to an actual Model or List[Model]
+        models = entity.mapper(models).model(perform_mapping=False)
+        if type(models) != list: models = [models]
+        if not models: return
+
+        # We cannot know which records will be inserted or updated so only fire the save hooks
+        await entity._fire_hooks(['BeforeSave'], models)
+
+        # Convert List[Model] into List of dict of mapped table columns, only after hooks are fired
+        rows = entity.mapper(models).table()
+        conflict = [entity.mapper(field).column() for field in (conflict or [entity.pk])]
+        if update is not None: update = [entity.mapper(field).column() for field in update]
+
+        await uvicore.db.query(entity.connection).table(entity.table).upsert(rows, conflict, update)
+
+        # Upserted records may already be in the identity map
+        identity.forget(entity)
+
+        await entity._fire_hooks(['AfterSave'], models)
+
+    @classmethod
+    async def insert_with_relations(entity, models: List[Dict], *, parent_pk = None, skip_save: bool = False, batch: bool = False) -> None:
         """Insert one or more entities as List of Dict that DO have relations included
 
         Because relations are included, this insert is NOT bulk and must
         loop each row, insert the parent, get the PK, then insert each
         children (or children first then parent depending on BelongsTo vs
         HasOne or HasMany)
+
+        With batch=True each level of the relation tree is inserted in multi-row
+        statements instead, and the List of new primary keys is returned.
         """
+        if batch:
+            if type(models) != list: models = [models]
+            return await entity._insert_batched(models)
 
         # Note about bulk insert with nested relations Dictionary
         # Bulk insert does not give back the primary keys for each inserted record
@@ -282,6 +320,131 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         # is why the method itself is -> None
         return parent_pk
 
+    @classmethod
+    async def _insert_batched(entity, models: List[Dict], need_pks: bool = True) -> List:
+        """Insert models and their nested relations one relation level at a time, returning each new PK"""
+        # Split each model into its own row and its relation data, by relation across all models
+        rows = []
+        relations = {}
+        for model in models:
+            # If model is not a dict, its probably a real pydantic model instance, convert it to a dict
+            if type(model) != dict: model = model.dict()
+            row = {}
+            for (fieldname, value) in model.items():
+                field = entity.modelfields.get(fieldname)
+                if not field or not field.relation:
+                    row[fieldname] = value
+                    continue
+                if fieldname not in relations: relations[fieldname] = (field.relation.fill(field), [])
+                if value: relations[fieldname][1].append((len(rows), value))
+            rows.append(row)
+        if not rows: return []
+
+        # BelongsTo children are inserted first, all of them at once, and their PK set on each parent row
+        for (relation, items) in relations.values():
+            if type(relation) != BelongsTo: continue
+            pending = []
+            for (i, data) in items:
+                if getvalue(data, relation.foreign_key):
+                    # Already inserted relation, use its existing PK
+                    rows[i][relation.local_key] = getvalue(data, relation.foreign_key)
+                else:
+                    pending.append((i, data))
+            pks = await relation.entity._insert_batched([data for (i, data) in pending])
+            for ((i, data), pk) in zip(pending, pks):
+                rows[i][relation.local_key] = pk
+
+        # Insert all parents.  PKs are only needed if a caller or a child relation uses them.
+        need_pks = need_pks or any([type(relation) != BelongsTo and items for (relation, items) in relations.values()])
+        pks = await entity._insert_rows(rows, need_pks)
+
+        # Each child relation is inserted as one batch for all parents, with the parent keys filled in memory
+        for (relation, items) in relations.values():
+            if type(relation) == BelongsTo: continue
+            if type(relation) in [HasOne, HasMany, MorphOne, MorphMany]:
+                children = []
+                for (i, data) in items:
+                    for child in (data if type(data) == list else [data]):
+                        if type(child) != dict: child = child.dict()
+                        child[relation.foreign_key] = pks[i]
+                        if type(relation) in [MorphOne, MorphMany]: child[relation.foreign_type] = entity.tablename
+                        children.append(child)
+                await relation.entity._insert_batched(children, need_pks=False)
+
+            elif type(relation) in [BelongsToMany, MorphToMany]:
+                # Insert children that do not exist yet, then link all children in the pivot table.
+                # Parents are new so none of these links can exist yet.
+                links = []
+                pending = []
+                for (i, data) in items:
+                    for child in (data if type(data) == list else [data]):
+                        pk = getvalue(child, relation.entity.pk)
+                        if pk is None:
+                            pending.append((i, child))
+                        else:
+                            links.append((pks[i], pk))
+                new_pks = await relation.entity._insert_batched([child for (i, child) in pending])
+                for ((i, child), pk) in zip(pending, new_pks):
+                    setvalue(child, relation.entity.pk, pk)
+                    links.append((pks[i], pk))
+
+                pivots = []
+                for (left_key_value, right_key_value) in dict.fromkeys(links):
+                    pivot = {relation.left_key: left_key_value, relation.right_key: right_key_value}
+                    if type(relation) == MorphToMany: pivot[relation.left_type] = entity.tablename
+                    pivots.append(pivot)
+                if pivots: await entity.execute(relation.join_table.insert().values(pivots))  # No hooks needed, relation table are NOT models, no listeners
+
+        return pks
+
+    @classmethod
+    async def _insert_rows(entity, rows: List[Dict], need_pks: bool = True) -> List:
+        """Insert rows of model fields in multi-row statements, returning each new PK if needed"""
+        if not rows: return []
+        models = entity.mapper(rows).model(perform_mapping=False)
+        await entity._fire_hooks(['BeforeInsert', 'BeforeSave'], models)
+
+        # Convert List[Model] into List of dict of mapped table columns, only after hooks are fired
+        table = entity.table
+        values = entity.mapper(models).table()
+        pk_column = entity.mapper(entity.pk).column()
+        chunk_size = uvicore.config.app.database.upsert_chunk_size or 1000
+        driver = str(uvicore.db.connection(entity.connection).driver)
+
+        pks = [getvalue(model, entity.pk) for model in models]
+        if not need_pks or all([pk is not None for pk in pks]):
+            # PKs not needed or already known (pre-allocated keys like a 'key' field)
+            for i in range(0, len(values), chunk_size):
+                await entity.execute(table.insert().values(values[i:i + chunk_size]))
+        elif driver.startswith('postgres') and isinstance(getattr(table.c, pk_column).type, sa.Integer):
+            # Rows from a multi-row INSERT ... RETURNING come back in no promised order.  Like SQLAlchemy's
+            # insertmanyvalues, insert from a VALUES list ordered by a sentinel counter so the sequence
+            # hands out PKs in row order, then sort the returned PKs to line them up with the rows
+            columns = [column for column in values[0] if column != pk_column or any([value[column] is not None for value in values])]
+            pks = []
+            for i in range(0, len(values), chunk_size):
+                data = sa.values(
+                    *[sa.column(column, getattr(table.c, column).type) for column in columns],
+                    sa.column('sen_counter', sa.Integer),
+                    name='imp_sen'
+                ).data([tuple([value[column] for column in columns]) + (n,) for (n, value) in enumerate(values[i:i + chunk_size])])
+                select = sa.select(*[sa.cast(getattr(data.c, column), getattr(table.c, column).type) for column in columns]).order_by(data.c.sen_counter)
+                query = table.insert().from_select(columns, select).returning(getattr(table.c, pk_column))
+                pks.extend(sorted([row[0] for row in await entity.fetchall(query)]))
+        elif driver.startswith('postgres'):
+            # Non integer PKs have no order to sort by, one INSERT ... RETURNING per row
+            pks = [(await entity.fetchone(table.insert().values(**value).returning(getattr(table.c, pk_column))))[0] for value in values]
+        else:
+            # MySQL has no RETURNING and SQLite gives no order for it, one statement per row is the only
+            # reliable way to get each new PK
+            pks = [await entity.execute(table.insert().values(**value)) for value in values]
+
+        for (model, pk) in zip(models, pks):
+            if getattr(model, entity.pk) is None: setattr(model, entity.pk, pk)
+            model._snapshot()
+        await entity._fire_hooks(['AfterInsert', 'AfterSave'], models)
+        return pks
+
     @hybridmethod
     def mapper(self_or_entity, *args) -> Mapper:
         """Entity mapper for model->table or table->model conversions
@@ -393,24 +556,26 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         #         #     'data': data
         #         # }
 
-        # Check if exists
+        # Check if exists.  Models loaded from or saved to the database are known to exist.
         exists = None
         table = entity.table
+        persisted = self._persisted is not None
         if getattr(self, entity.pk):
-            query = sa.select([getattr(table.c, entity.mapper(entity.pk).column())]).select_from(table).where(getattr(table.c, entity.pk) == getattr(self, entity.pk))
-            #query = table.select().where(getattr(table.c, entity.pk) == getattr(self, entity.pk))  # Don't select *
-            exists = await entity.fetchone(query)  # Returns None if not exists
+            exists = persisted or await entity.query().where(entity.pk, getattr(self, entity.pk)).exists()
 
         if exists:
             # Record exists, perform update
             await self._before_save()
 
             # Convert self model instance into Dict of mapped table columns, only after hooks are fired
-            # only after hooks are fired as they may alter the data
-            values = self.mapper().table()
+            # only after hooks are fired as they may alter the data.  Persisted models only update changed columns.
+            values = self._dirty() if persisted else self.mapper().table()
 
-            query = table.update().where(getattr(table.c, entity.pk) == getattr(self, entity.pk)).values(**values)
-            await entity.execute(query)
+            # Nothing changed, skip the write
+            if values:
+                query = table.update().where(getattr(table.c, entity.pk) == getattr(self, entity.pk)).values(**values)
+                await entity.execute(query)
+            self._snapshot()
             await self._after_save()
         else:
             # New record, perform insert
@@ -429,6 +594,7 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
             if getattr(self, entity.pk) is None:
                 setattr(self, entity.pk, new_pk)
 
+            self._snapshot()
             await self._after_insert()
             await self._after_save()
 
@@ -447,6 +613,10 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         # for relation_name, data in relations.items():
         #     await self.create(relation_name, data)
 
+        # Any instance in the identity map is now stale.  This one is not remembered in its
+        # place as it may carry relations, the next plain query loads a fresh one.
+        identity.forget(entity, getattr(self, entity.pk))
+
         # Return model with new PK value
         return self
 
@@ -495,6 +665,9 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
             else:
                 raise Exception('Deleteing children does not work for this type of relation.')
 
+            # Deleted children may still be in the identity map
+            identity.forget(relation.entity)
+
             # Not sure I should implement OneToMany as you would need to be able to pass in WHICH items to delete
             # but if you go through all that trouble to get the right children models to pass in, you could just
             # delete from the actual child yourself (comments.where(post=1).delete() for example)
@@ -505,6 +678,7 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
             query = table.delete().where(getattr(table.c, entity.pk) == getattr(self, entity.pk))
             await self._before_delete()
             await entity.execute(query)
+            identity.forget(entity, getattr(self, entity.pk))
             await self._after_delete()
 
     async def link(self, relation_name: str, models: Union[Any, List[Any]]) -> None:
@@ -530,82 +704,73 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         # Ensure models are always a list
         if type(models) != list: models = [models]
 
-        # Insert linkage data one link at a time so we can gracefully skip duplicates
-        if type(relation) == BelongsToMany:
-            for model in models:
-                # Set pivot relation data
-                left_key_value = getvalue(self, entity.pk)
-                right_key_value = getvalue(model, relation.entity.pk)
-                pivot = {
-                    relation.left_key: left_key_value,
-                    relation.right_key: right_key_value
-                }
-
-                # Check if exists.
-                # The encode/databases layer does NOT abstract each backend DB libraries exceptions
-                # into a common interface so You cannot catch generic IntegrityError.  So instead of a
-                # try catch, I will see if the record exists manually first :( - See https://github.com/encode/databases/issues/162
-                table = relation.join_table
-                query = (
-                    sa.select([getattr(table.c, relation.left_key)]).select_from(table)
-                    .where(getattr(table.c, relation.left_key) == left_key_value)
-                    .where(getattr(table.c, relation.right_key) == right_key_value)
-                )
-                exists = await entity.fetchone(query)  # Returns None if not exists
+        # Linking only works for Many-To-Many relations
+        if type(relation) != BelongsToMany and type(relation) != MorphToMany:
+            raise Exception('Linking is for Many-To-Many relations only.')
 
-                if not exists:
-                    query = relation.join_table.insert().values(**pivot)
-                    await entity.execute(query)  # No hooks needed, relation table are NOT models, no listeners
+        # Only insert links that do not exist yet.  All existing links are found in one IN query.
+        # The encode/databases layer does NOT abstract each backend DB libraries exceptions
+        # into a common interface so You cannot catch generic IntegrityError.  So instead of a
+        # try catch, I will see if the records exist manually first :( - See https://github.com/encode/databases/issues/162
+        right_key_values = list(dict.fromkeys([getvalue(model, relation.entity.pk) for model in models]))
+        existing = await self._linked(relation, right_key_values)
+        await self._link_pivots(relation, [x for x in right_key_values if x not in existing])
 
-                # # Try insert, fail silently if exists
-                # try:
-                #     query = relation.join_table.insert().values(**pivot)
-                #     await entity.execute(query)
-                # except:
-                #     # Ignore Integrity Errors
-                #     pass
+    async def sync(self, relation_name: str, models: Union[Any, List[Any]]) -> None:
+        """Link exactly these records to relation, unlinking all others, using the Many-To-Many pivot table"""
 
-        elif type(relation) == MorphToMany:
-            for model in models:
-                # Set polymorphic pivor relation data
-                left_type_value = entity.tablename
-                left_key_value = getvalue(self, entity.pk)
-                right_key_value = getvalue(model, relation.entity.pk)
-                pivot = {
-                    relation.left_type: left_type_value,
-                    relation.left_key: left_key_value,
-                    relation.right_key: right_key_value
-                }
+        # Get the entity of this model instance (which is the metaclass, aka self.__class__)
+        entity = self.__class__
 
-                # Check if exists.
-                # The encode/databases layer does NOT abstract each backend DB libraries exceptions
-                # into a common interface so You cannot catch generic IntegrityError.  So instead of a
-                # try catch, I will see if the record exists manually first :( - See https://github.com/encode/databases/issues/162
-                table = relation.join_table
-                query = (
-                    sa.select([getattr(table.c, relation.left_type)]).select_from(table)
-                    .where(getattr(table.c, relation.left_type) == left_type_value)
-                    .where(getattr(table.c, relation.left_key) == left_key_value)
-                    .where(getattr(table.c, relation.right_key) == right_key_value)
-                )
-                exists = await entity.fetchone(query)  # Returns None if not exists
+        # Get field and relation info
+        field = entity.modelfield(relation_name)
+        relation = field.relation.fill(field)
+        if type(relation) != BelongsToMany and type(relation) != MorphToMany:
+            raise Exception('Syncing is for Many-To-Many relations only.')
 
-                if not exists:
-                    query = relation.join_table.insert().values(**pivot)
-                    await entity.execute(query)  # No hooks needed, relation table are NOT models, no listeners
+        # Ensure models are always a list
+        if not models: models = []
+        if type(models) != list: models = [models]
+        right_key_values = list(dict.fromkeys([getvalue(model, relation.entity.pk) for model in models]))
 
+        # Unlink everything else in one statement.  No hooks needed, relation table are NOT models, no listeners
+        table = relation.join_table
+        query = table.delete()
+        for where in self._pivot_wheres(relation): query = query.where(where)
+        if right_key_values: query = query.where(getattr(table.c, relation.right_key).notin_(right_key_values))
+        await entity.execute(query)
 
-                # Try insert, fail silently if exists
-                # try:
-                #     query = relation.join_table.insert().values(**pivot)
-                #     await entity.execute(query)
-                # except pymysql.err.IntegrityError:
-                #     # Ignore Integrity Errors
-                #     pass
+        # Then insert only the missing links in one statement
+        existing = await self._linked(relation, right_key_values)
+        await self._link_pivots(relation, [x for x in right_key_values if x not in existing])
 
-        else:
-            # Linking only works for Many-To-Many relations
-            raise Exception('Linking is for Many-To-Many relations only.')
+    def _pivot_wheres(self, relation) -> List:
+        """Pivot table where clauses matching all links of this (self) model"""
+        entity = self.__class__
+        table = relation.join_table
+        wheres = [getattr(table.c, relation.left_key) == getvalue(self, entity.pk)]
+        if type(relation) == MorphToMany: wheres.append(getattr(table.c, relation.left_type) == entity.tablename)
+        return wheres
+
+    async def _linked(self, relation, right_key_values: List) -> set:
+        """Which of these related keys are already linked to this (self) model"""
+        if not right_key_values: return set()
+        table = relation.join_table
+        right_key = getattr(table.c, relation.right_key)
+        query = sa.select(right_key).where(right_key.in_(right_key_values))
+        for where in self._pivot_wheres(relation): query = query.where(where)
+        return set([row[0] for row in await self.__class__.fetchall(query)])
+
+    async def _link_pivots(self, relation, right_key_values: List) -> None:
+        """Insert pivot rows linking these related keys to this (self) model in one statement"""
+        if not right_key_values: return
+        entity = self.__class__
+        pivots = []
+        for right_key_value in right_key_values:
+            pivot = {relation.left_key: getvalue(self, entity.pk), relation.right_key: right_key_value}
+            if type(relation) == MorphToMany: pivot[relation.left_type] = entity.tablename
+            pivots.append(pivot)
+        await entity.execute(relation.join_table.insert().values(pivots))  # No hooks needed, relation table are NOT models, no listeners
 
     async def unlink(self, relation_name: str, models: Union[Any, List[Any]] = None) -> None:
         """Unlink records to relation using the Many-To-Many pivot table"""
@@ -650,35 +815,78 @@ class Model(Generic[E], PydanticBaseModel, ModelInterface[E]):
         else:
             raise Exception('Uninking is for Many-To-Many relations only.')
 
+    def _snapshot(self) -> None:
+        """Remember the current field values as the persisted state of this model"""
+        self._persisted = snapshot({name: value for (name, value) in self.__dict__.items() if name in self.__class__.modelfields})
+
+    def _dirty(self) -> Dict:
+        """Mapped table columns that changed since this model was loaded or saved"""
+        persisted = self._persisted
+        if persisted is None: return self.mapper().table()
+        dirty = {}
+        fields_set = self.__fields_set__
+        for (name, value) in self.__dict__.items():
+            field = self.__class__.modelfields.get(name)
+            if not field or not field.column or field.read_only: continue
+
+            # Fields not loaded (partial models) are only written once assigned
+            if name in persisted:
+                if value == persisted[name]: continue
+            elif name not in fields_set:
+                continue
+            dirty[field.column] = value
+        return dirty
+
     async def _before_insert(self) -> None:
         """Hook fired before record is inserted (new records only)"""
-        event_name = 'uvicore.orm-{' +  self.__class__.modelfqn + '}-BeforeInsert'
-        await uvicore.events.codispatch(event_name, {'model': self})
+        await self.__class__._dispatch('BeforeInsert', {'model': self})
 
     async def _after_insert(self) -> None:
         """Hook fired after record is inserted (new records only)"""
-        event_name = 'uvicore.orm-{' + self.__class__.modelfqn + '}-AfterInsert'
-        await uvicore.events.dispatch_async(event_name, {'model': self})
+        await self.__class__._dispatch('AfterInsert', {'model': self})
 
     async def _before_save(self) -> None:
         """Hook fired before record is saved (inserted or updated)"""
-        event_name = 'uvicore.orm-{' +  self.__class__.modelfqn + '}-BeforeSave'
-        await uvicore.events.codispatch(event_name, {'model': self})
+        await self.__class__._dispatch('BeforeSave', {'model': self})
 
     async def _after_save(self) -> None:
         """Hook fired after record is saved (inserted or updated)"""
-        event_name = 'uvicore.orm-{' + self.__class__.modelfqn + '}-AfterSave'
-        await uvicore.events.dispatch_async(event_name, {'model': self})
+        await self.__class__._dispatch('AfterSave', {'model': self})
 
     async def _before_delete(self) -> None:
         """Hook fired before record is deleted"""
-        event_name = 'uvicore.orm-{' +  self.__class__.modelfqn + '}-BeforeDelete'
-        await uvicore.events.codispatch(event_name, {'model': self})
+        await self.__class__._dispatch('BeforeDelete', {'model': self})
 
     async def _after_delete(self) -> None:
         """Hook fired after record is deleted"""
-        event_name = 'uvicore.orm-{' + self.__class__.modelfqn + '}-AfterDelete'
-        await uvicore.events.dispatch_async(event_name, {'model': self})
+        await self.__class__._dispatch('AfterDelete', {'model': self})
+
+    @classmethod
+    async def _dispatch(entity, hook: str, payload: Dict) -> None:
+        """Fire the uvicore.orm-{modelfqn}-{hook} event, skipped entirely if nothing listens"""
+        event_name = 'uvicore.orm-{' + entity.modelfqn + '}-' + hook
+        if uvicore.events.has_listeners(event_name):
+            await uvicore.events.codispatch(event_name, payload)
+
+    @classmethod
+    async def _fire_hooks(entity, hooks: List[str], models: List[E]) -> None:
+        """Fire hooks for each model in order, followed by one {hook}Many event per hook with all models
+
+        Each model fires all of its hooks (like BeforeInsert then BeforeSave) before the next model.
+        A hook is only called if the model overrides it or its per model event has listeners,
+        so bulk inserts skip empty dispatch entirely.
+        """
+        methods = []
+        for hook in hooks:
+            method = '_' + re.sub(r'(?<!^)(?=[A-Z])', '_', hook).lower()
+            if getattr(entity, method) is not getattr(Model, method) or uvicore.events.has_listeners('uvicore.orm-{' + entity.modelfqn + '}-' + hook):
+                methods.append(method)
+        if methods:
+            for model in models:
+                for method in methods:
+                    await getattr(model, method)()
+        for hook in hooks:
+            await entity._dispatch(hook + 'Many', {'models': models})
 
 
 
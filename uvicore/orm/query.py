@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import operator as operators
 import os
 
 from collections import OrderedDict as ODict
-from copy import deepcopy
-from typing import Any, Dict, Generic, List, OrderedDict, Tuple, TypeVar, Union, Callable
+from copy import copy
+from datetime import date, datetime
+from typing import Any, AsyncGenerator, Dict, Generic, List, Optional, OrderedDict, Tuple, TypeVar, Union, Callable
 from uvicore.support.hash import sha1
 
 import sqlalchemy as sa
@@ -14,11 +18,15 @@ from sqlalchemy.sql.expression import BinaryExpression
 
 import uvicore
 from uvicore.contracts import OrmQueryBuilder as BuilderInterface
-from uvicore.database.builder import QueryBuilder, Join, Query
+from uvicore.database import tags
+from uvicore.database.builder import QueryBuilder, Join, Query, plans
 from uvicore.orm.fields import (BelongsTo, BelongsToMany, Field, HasMany,
                                 HasOne, MorphMany, MorphOne, MorphToMany)
 from uvicore.orm.fields import Relation
+from uvicore.orm import identity
+from uvicore.orm.hydrator import hydrator
 from uvicore.support.collection import getvalue
+from uvicore.support.concurrency import run_in_threadpool
 from uvicore.support.dumper import dd, dump
 
 B = TypeVar("B")  # Builder Type (DbQueryBuilder or OrmQueryBuilder)
@@ -33,6 +41,9 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         self.entity = entity
         super().__init__()
 
+        # Opaque cursor of the last row after a keyset paginated .get(), see .after()
+        self.next_cursor: Optional[str] = None
+
         # Not all models require tables (databaseless models)
         if entity.table is not None:
             self.query.table = entity.table
@@ -104,6 +115,19 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             self.query.includes.append(include)
         return self
 
+    def select(self, *args) -> B[B, E]:
+        """Select only these model fields, including dotted relation fields, and return partial models
+
+        The primary key of each model, and any keys needed to merge relations, are always selected.
+        Relations of dotted fields are included automatically.
+        """
+        for field in args:
+            self.query.selects.append(field)
+            if '.' in field:
+                include = '.'.join(field.split('.')[0:-1])
+                if include not in self.query.includes: self.query.includes.append(include)
+        return self
+
     def filter(self, column: Union[str, BinaryExpression, List[Union[Tuple, BinaryExpression]]], operator: str = None, value: Any = None) -> B[B, E]:
         """Filter child relationship by this AND clause"""
         # Filters are for Many relations only
@@ -186,6 +210,36 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         self.query.keyed_by = field
         return self
 
+    def selectin(self, chunk_size: int = None) -> B[B, E]:
+        """Load *Many relations by an IN list of the main results primary keys"""
+        self.query.selectin = chunk_size or True
+        return self
+
+    def trusted(self, trusted: bool = True) -> B[B, E]:
+        """Build models without pydantic validation of rows from our own database"""
+        self.query.trusted = trusted
+        return self
+
+    def offload(self, offload: bool = True) -> B[B, E]:
+        """Build models in a worker thread so large results do not block the event loop"""
+        self.query.offload = offload
+        return self
+
+    def concurrency(self, limit: int) -> B[B, E]:
+        """Max number of *Many relation queries to run at the same time"""
+        self.query.concurrency = limit
+        return self
+
+    def after(self, cursor: str = None) -> B[B, E]:
+        """Keyset paginate on the order_by columns, only returning rows after this cursor
+
+        Use with .limit().  After .get() the cursor of the last row is in .next_cursor,
+        or None if this was the last page.  Pass None to get the first page.
+        """
+        self.query.keyset = True
+        self.query.after = self._decode_cursor(cursor) if cursor else None
+        return self
+
     def show_writeonly(self, fields: List = None):
         if fields is None:
             self.query.show_writeonly = True
@@ -199,7 +253,9 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         sqls = {}
         for query in queries:
             #sqls += '-- ' + query.get('name').upper() + ':' + os.linesep + query.get('sql') + os.linesep + os.linesep
-            sqls[query.get('name')] = query.get('sql').replace('\n', '')
+            # SQL strings are compiled here on demand, never while building queries
+            saquery = query.get('saquery')
+            sqls[query.get('name')] = str(saquery).replace('\n', '') if saquery is not None else ''
         return sqls
 
     def queries(self, method: str = 'select') -> List:
@@ -242,15 +298,17 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             # Load up the custom backend and fire off the get() executor
             #dump('not sqlalchemy')
 
-        # Build SQLAlchemy select queries
-        queries = self._build_orm_queries('select')
+        # Build SQLAlchemy select queries from the plan cache
+        queries = self._build_planned_orm_queries('select')
         #dump(queries)
 
-        self.log.nl().header('Queries')
-        self.log.dump(queries)
+        # Only build diagnostics if the uvicore.orm logger will actually output them
+        if self.log.enabled():
+            self.log.nl().header('Queries')
+            self.log.dump(queries)
 
-        self.log.header('Raw SQL Queries')
-        self.log.info(self.sql('select', queries))
+            self.log.header('Raw SQL Queries')
+            self.log.info(self.sql('select', queries))
 
         # Get hook?  Experimental
         if hasattr(self.entity, 'get'):
@@ -262,60 +320,219 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             prefix = 'uvicore.orm/'
             if cache.get('key') is None:
                 # No cache name specified, automatically build unique based on queries
-                query_hash = ''
-                for query in queries:
-                    if query['name'] == 'main':
-                        query_hash = query.get('query').hash(
-                            hash_type='sha1',
-                            package='uvicore.orm',
-                            entity=self.entity,
-                            connection=self._connection()
-                        )
-                        break
+                # Hash our own query as planned queries only hold bind parameter names
+                query_hash = self.query.hash(
+                    hash_type='sha1',
+                    package='uvicore.orm',
+                    entity=self.entity,
+                    connection=self._connection()
+                )
                 cache['key'] = prefix + query_hash
                 #dump(query_hash)
             else:
                 cache['key'] = prefix + cache.get('key')
 
-        if cache and await uvicore.cache.has(cache.get('key')):
-            # Cache found, use cached results
-            #dump('ORM FROM CACHE')
-            entities = await uvicore.cache.get(cache.get('key'))
-        else:
-            # Execute each query
-            results = None
-            main_query = None
-            has_many = {}
-            for query in queries:
-                if query.get('name') == 'main':
-                    main_query = query.get('query')
-                    results = await self.entity.fetchall(query.get('saquery'))
-                else:
-                    has_many[query.get('name')] = await self.entity.fetchall(query.get('saquery'))
+        async def fetch():
+            # Execute main query and all *Many relation queries
+            main_query, results, has_many = await self._fetch_orm_queries(queries)
 
             # Convert results to List of entities
-            entities = self._build_orm_results(main_query, results, has_many)
+            return await self._build_orm_results_offloaded(main_query, results, has_many)
+
+        if cache:
+            # Cached results are only used if none of their tables were written since.
+            # Concurrent callers of the same missing key share one set of queries.
+            key = tags.versioned(cache.get('key'), await self._cache_versions(self.query))
+            entities = await uvicore.cache.remember(key, fetch, seconds=cache.get('seconds'), stale=cache.get('stale'))
+        else:
+            entities = await fetch()
 
-            # Add to cache if desired
-            if cache: await uvicore.cache.put(cache.get('key'), entities, seconds=cache.get('seconds'))
+        # Keyset pagination cursor of the last entity
+        self.next_cursor = self._next_cursor(entities)
 
         # Return List of Entities
         return entities
 
+    async def chunk(self, size: int = None) -> AsyncGenerator[Union[List[E], Dict[str, E]], None]:
+        """Execute a select query and yield entities in chunks of size rows at a time
+
+        Rows are streamed from the database cursor so the entire result set is never
+        held in memory.  *Many relations are loaded per chunk by primary key.
+        """
+        size = size or uvicore.config.app.orm.chunk_size or 1000
+
+        # *Many relations can only be loaded for each chunk by an IN list of its primary keys
+        if not self.query.selectin: self.query.selectin = True
+
+        queries = self._build_planned_orm_queries('select')
+        main = queries[0]
+
+        rows = []
+        async for row in self.entity.iterate(main.get('saquery')):
+            rows.append(row)
+            if len(rows) == size:
+                yield await self._build_orm_chunk(queries, rows)
+                rows = []
+        if rows:
+            yield await self._build_orm_chunk(queries, rows)
+
+    async def stream(self, chunk_size: int = None) -> AsyncGenerator[E, None]:
+        """Execute a select query and yield one entity at a time as rows are fetched"""
+        async for entities in self.chunk(chunk_size):
+            if type(entities) == dict: entities = entities.values()
+            for entity in entities:
+                yield entity
+
+    async def _build_orm_chunk(self, queries: List, rows: List) -> Union[List[E], Dict[str, E]]:
+        has_many = await self._fetch_orm_relations(queries[1:], rows)
+        return await self._build_orm_results_offloaded(queries[0].get('query'), rows, has_many)
+
+    async def _fetch_orm_queries(self, queries: List) -> Tuple:
+        # Main query is always first, all others are *Many relation queries
+        main = queries[0]
+        results = await self.entity.fetchall(main.get('saquery'))
+
+        # Fetch all *Many relations of these main results
+        has_many = await self._fetch_orm_relations(queries[1:], results)
+        return (main.get('query'), results, has_many)
+
+    async def _fetch_orm_relations(self, secondaries: List, results: List) -> Dict:
+        # No main results means there is nothing to merge *Many relations into
+        has_many = {}
+        if not results or not secondaries: return has_many
+
+        # Selectin queries are split into one statement per chunk of main primary keys
+        statements = []
+        for query in secondaries:
+            if query.get('selectin'):
+                for saquery in self._selectin_statements(query.get('saquery'), results):
+                    statements.append((query.get('name'), saquery))
+            else:
+                statements.append((query.get('name'), query.get('saquery')))
+
+        if uvicore.db.pinned(self._connection()):
+            # All queries share the connection pinned by connect() or transaction(), which runs
+            # one query at a time anyway, so gathering them would only queue on its lock
+            rows = [await self.entity.fetchall(saquery) for (name, saquery) in statements]
+        else:
+            # Run all *Many relation queries concurrently.  Each query acquires its own
+            # pooled connection, so limit how many run at once to protect the pool.
+            semaphore = asyncio.Semaphore(self._concurrency())
+            async def fetch(saquery):
+                async with semaphore:
+                    return await self.entity.fetchall(saquery)
+
+            rows = await asyncio.gather(*[fetch(saquery) for (name, saquery) in statements])
+        for query in secondaries:
+            has_many[query.get('name')] = []
+        for (name, saquery), data in zip(statements, rows):
+            has_many[name].extend(data)
+        return has_many
+
+    def _selectin_statements(self, saquery, results: List) -> List:
+        # Unique primary keys of the main results, in chunks of selectin size
+        pk_column = self.entity.mapper(self.entity.pk).column()
+        pks = list(dict.fromkeys([getattr(row, pk_column) for row in results]))
+        size = self._selectin_size()
+        sacol = self.query.table.columns.get(pk_column)
+        return [saquery.where(sacol.in_(pks[i:i + size])) for i in range(0, len(pks), size)]
+
+    def _keyset_order(self, query: Query) -> List[Tuple]:
+        """Order_by columns of a keyset paginated query with the primary key as a unique tiebreaker"""
+        order = []
+        for order_by in query.order_by:
+            if type(order_by) != tuple or type(order_by[0]) != str or '.' in order_by[0]:
+                raise Exception('Keyset pagination only supports order_by on fields of the {} model'.format(self.entity.modelname))
+            order.append(order_by)
+        if self.entity.pk not in [x[0] for x in order]:
+            order.append((self.entity.pk, 'ASC'))
+        return order
+
+    def _keyset_where(self, query: Query, values: List) -> Any:
+        """Row value comparison (a, b) > (x, y) as (a > x) OR (a = x AND b > y) for mixed ASC/DESC orders"""
+        if len(values) != len(query.order_by):
+            raise Exception('Pagination cursor does not match the order_by of this query')
+        columns = [self._column(column, query).sacol for (column, order) in query.order_by]
+        seeks = []
+        for i, (column, order) in enumerate(query.order_by):
+            ands = [columns[x] == values[x] for x in range(i)]
+            ands.append(columns[i] < values[i] if order == 'DESC' else columns[i] > values[i])
+            seeks.append(sa.and_(*ands))
+        return sa.or_(*seeks)
+
+    def _next_cursor(self, entities: Union[List[E], Dict[str, E]]) -> Optional[str]:
+        """Cursor of the last entity if this keyset paginated page was full"""
+        if not self.query.keyset or not self.query.limit: return None
+        if type(entities) == dict: entities = list(entities.values())
+        if len(entities) < self.query.limit: return None
+        last = entities[-1]
+        return self._encode_cursor([getattr(last, field) for (field, order) in self._keyset_order(self.query)])
+
+    def _encode_cursor(self, values: List) -> str:
+        def encode(value):
+            # JSON has no dates, tag them so they decode back to the same type
+            if isinstance(value, datetime): return {'datetime': value.isoformat()}
+            if isinstance(value, date): return {'date': value.isoformat()}
+            return value
+        data = json.dumps([encode(x) for x in values], default=str)
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def _decode_cursor(self, cursor: str) -> List:
+        def decode(value):
+            if type(value) == dict and 'datetime' in value: return datetime.fromisoformat(value['datetime'])
+            if type(value) == dict and 'date' in value: return date.fromisoformat(value['date'])
+            return value
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        except Exception:
+            raise Exception('Invalid pagination cursor {}'.format(cursor))
+        if type(values) != list: raise Exception('Invalid pagination cursor {}'.format(cursor))
+        return [decode(x) for x in values]
+
+    def _selectin_size(self) -> int:
+        # Builder .selectin() wins over app config orm.selectin.  A value of True
+        # uses orm.selectin_chunk_size (default 500) keys per IN list.
+        selectin = self.query.selectin or uvicore.config.app.orm.selectin
+        if not selectin and self.query.keyset:
+            # Keyset pages must load *Many relations by primary key of only the rows of this page
+            selectin = True
+        if not selectin: return 0
+        if selectin is True: return int(uvicore.config.app.orm.selectin_chunk_size or 500)
+        return int(selectin)
+
+    def _trusted(self) -> bool:
+        if self.query.trusted is not None: return bool(self.query.trusted)
+        return bool(uvicore.config.app.orm.trusted)
+
+    def _offload(self, rows: int) -> bool:
+        # Builder .offload() wins over app config orm.offload_threshold, the number of
+        # fetched rows from which models are built in a worker thread.  Unset or 0 never offloads.
+        if self.query.offload is not None: return bool(self.query.offload)
+        threshold = uvicore.config.app.orm.offload_threshold
+        return bool(threshold) and rows >= int(threshold)
+
+    def _concurrency(self) -> int:
+        # Builder .concurrency() wins over app config orm.concurrency
+        limit = self.query.concurrency or uvicore.config.app.orm.concurrency or 4
+        return max(1, int(limit))
+
     async def delete(self) -> None:
         """Execute delete query"""
 
         # Build SQLAlchemy delete query
-        query, saquery = self._build_query('delete', self.query.copy())
+        query, saquery = self._build_planned_query('delete')
 
         # Execute query
         await self.entity.execute(saquery)
 
+        # Any deleted model may be in the identity map
+        identity.forget(self.entity)
+
     async def update(self, **kwargs) -> None:
         """Execute update query"""
 
         # Build SQLAlchemy delete query
-        query, saquery = self._build_query('update', self.query.copy())
+        query, saquery = self._build_planned_query('update')
 
         # Add in values
         saquery = saquery.values(**kwargs)
@@ -323,19 +540,191 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         # Execute query
         await self.entity.execute(saquery)
 
-    def _build_orm_queries(self, method: str) -> List:
+        # Any updated model in the identity map is now stale
+        identity.forget(self.entity)
+
+    def _build_planned_orm_queries(self, method: str) -> List:
+        """Build all ORM queries from the plan cache, only rebinding parameter values"""
+        shape = self._plan_shape(method, self.query)
+        if shape is None:
+            # Query contains raw SQLAlchemy expressions and cannot be planned
+            return self._build_orm_queries(method)
+
+        source, values = self._parameterize(self.query)
+        queries = plans.get(shape)
+        if queries is None:
+            queries = self._build_orm_queries(method, source)
+            plans.put(shape, queries)
+            return queries
+
+        if not values: return queries
+        return [
+            {**query, 'saquery': query.get('saquery').params(values)} if query.get('saquery') is not None else query
+            for query in queries
+        ]
+
+    def _plan_shape(self, method: str, query: Query) -> Optional[Tuple]:
+        shape = super()._plan_shape(method, query)
+        if shape is None: return None
+        show_writeonly = query.show_writeonly
+        if type(show_writeonly) == list: show_writeonly = tuple(show_writeonly)
+        return shape + (
+            self.entity,
+            tuple(query.includes),
+            show_writeonly,
+            query.keyed_by,
+            self._selectin_size(),
+        )
+
+    def _aggregate_query(self, query: Query) -> Query:
+        # Count, exists and aggregates need the same relation joins as the main query
+        query = query.copy()
+        self._build_orm_relations(query)
+        self._build_orm_semijoins(query, query)
+        return query
+
+    def _cache_tables(self, query: Query) -> List[str]:
+        # Relation joins are aliased, so use the tables of the relations and their pivots instead
+        query = query.copy()
+        self._build_orm_relations(query)
+        names = [self.entity.table.name]
+        for relation in query.relations.values():
+            names.append(relation.entity.table.name)
+            join_table = getvalue(relation, 'join_table')
+            if join_table is not None: names.append(join_table.name)
+        return list(dict.fromkeys(names))
+
+    def _build_orm_semijoins(self, query: Query, source: Query, grain: str = None) -> None:
+        """Replace joins of *Many relations that fan out rows with EXISTS semi-joins
+
+        The grain is the *Many relation whose rows a secondary query returns, its joins are kept.
+        Sets query.distinct, only needed if rows can still fan out.
+        """
+        # Raw SQLAlchemy expressions may use any joined table, keep all joins and DISTINCT
+        for items in (source.wheres, source.or_wheres, source.filters, source.or_filters, source.order_by, source.sort):
+            for item in items:
+                if type(item) != tuple:
+                    query.distinct = True
+                    return
+
+        roots = self._fanout_roots(query, grain)
+        if not roots:
+            query.distinct = False
+            return
+
+        # Fan out joins are still needed to order, or to match a NULL the way an outer join does
+        for order_by in query.order_by:
+            if roots.get(self._where_relation(order_by)):
+                query.distinct = True
+                return
+        for where in query.wheres + query.or_wheres:
+            if type(where) == tuple and roots.get(self._where_relation(where)) and self._is_null(where[2]):
+                query.distinct = True
+                return
+
+        # AND wheres on the same *Many relation must match the same related row, one EXISTS each.
+        # OR wheres each get their own EXISTS.
+        groups = ODict()
+        wheres = []
+        for where in query.wheres:
+            root = roots.get(self._where_relation(where))
+            if root is None:
+                wheres.append(where)
+            else:
+                if root not in groups: groups[root] = []
+                groups[root].append(where)
+        for root, group in groups.items():
+            wheres.append(self._build_orm_exists(query, root, group))
+
+        or_wheres = []
+        for where in query.or_wheres:
+            root = roots.get(self._where_relation(where))
+            if root is None:
+                or_wheres.append(where)
+            else:
+                or_wheres.append(self._build_orm_exists(query, root, [where]))
+
+        # Remove all fan out joins, including Many-To-Many pivot joins
+        query.wheres = wheres
+        query.or_wheres = or_wheres
+        query.joins = [join for join in query.joins if self._join_relation(join) not in roots]
+        query.distinct = False
+
+    def _build_orm_exists(self, query: Query, root: str, wheres: List[Tuple]) -> Any:
+        # Only join the relations from the root *Many relation down to each where
+        root_depth = len(root.split('__'))
+        needed = {}
+        for where in wheres:
+            parts = self._where_relation(where).split('__')
+            for i in range(root_depth, len(parts) + 1):
+                needed['__'.join(parts[0:i])] = True
+        joins = [join for join in query.joins if self._join_relation(join) in needed]
+
+        # The first join (the root or its pivot table) correlates to the outer query
+        # by its onclause, the rest are joined inside the subquery
+        first = joins[0]
+        tables = first.table
+        for join in joins[1:]:
+            method = getattr(tables, join.method)
+            tables = method(right=join.table, onclause=join.onclause)
+        subquery = (sa.select(sa.literal(1))
+            .select_from(tables)
+            .where(first.onclause)
+            .where(sa.and_(*self._build_where(query, wheres)))
+        )
+        return sa.exists(subquery)
+
+    def _fanout_roots(self, query: Query, grain: str = None) -> Dict[str, str]:
+        """Relation names that fan out rows of this query, mapped to the first *Many relation in their path"""
+        grain_parts = grain.split('__') if grain else []
+        roots = {}
+        for name in query.relations.keys():
+            parts = name.split('__')
+            for i in range(1, len(parts) + 1):
+                # The grain and its parents are the rows of this query, not a fan out
+                if i <= len(grain_parts) and parts[0:i] == grain_parts[0:i]: continue
+                prefix = '__'.join(parts[0:i])
+                relation = query.relations.get(prefix)
+                if relation is not None and relation.is_many():
+                    roots[name] = prefix
+                    break
+        return roots
+
+    def _where_relation(self, where: Tuple) -> Optional[str]:
+        # Relation name of a ('relation.field', operator, value) where, None if on the main model
+        if type(where) != tuple or type(where[0]) != str or '.' not in where[0]: return None
+        return '__'.join(where[0].split('.')[0:-1])
+
+    def _join_relation(self, join: Join) -> str:
+        # Many-To-Many pivot joins belong to their relation
+        if join.alias.endswith('__pivot'): return join.alias[0:-len('__pivot')]
+        return join.alias
+
+    def _build_orm_queries(self, method: str, source: Query = None) -> List:
         # Different than the single _build_query in the DB Builder
         # This one is for ORM only and build multiple DB queries from one ORM query.
+        # Source is the builders query, or a parameterized copy of it from the plan cache
+        if source is None: source = self.query
         queries = []
 
         # First query
-        query = self.query.copy()
+        query = source.copy()
 
         # Build relation (join) queries
         self._build_orm_relations(query)
 
+        # Keyset pagination, seek past the cursor on the order_by columns.
+        # Only the main query is paged, *Many relations are loaded by selectin
+        if query.keyset:
+            query.order_by = self._keyset_order(query)
+            if query.after is not None:
+                query.wheres.append(self._keyset_where(query, query.after))
+
+        # Model fields of a partial .select() by relation name
+        projection = self._projection(query, source.selects)
+
         # Add all columns from main model
-        query.selects = self.entity.selectable_columns(show_writeonly=self.query.show_writeonly)
+        query.selects = self.entity.selectable_columns(show_writeonly=source.show_writeonly, fields=projection.get('primary'))
 
         # Add all selects where any nested relation is NOT a *Many
         relation: Relation
@@ -343,10 +732,13 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             if not relation.contains_many(query.relations):
                 # Don't use the relation.entity table to get columns, use the join aliased table
                 table = self._get_join_table(query, alias=relation.name)
-                columns = relation.entity.selectable_columns(table, show_writeonly=self.query.show_writeonly)
+                columns = relation.entity.selectable_columns(table, show_writeonly=source.show_writeonly, fields=projection.get(relation.name))
                 for column in columns:
                     query.selects.append(column.label(quoted_name(relation.name + '__' + column.name, True)))
 
+        # Wheres on *Many relations become EXISTS semi-joins instead of joins
+        self._build_orm_semijoins(query, source)
+
         # Build first query
         saquery = None
         if query.table is not None:
@@ -355,12 +747,12 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             'name': 'main',
             'query': query,
             'saquery': saquery,
-            'sql': str(saquery) if saquery is not None else '',
         })
 
 
         # So we have our first query perfect
         # Now we need to build a second or more queries for all *Many relations
+        selectin = bool(self._selectin_size())
         relation: Relation
         for relation in query.relations.values():
             # Only handle *Many relations
@@ -370,7 +762,17 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             rel_dot = relation.name.replace('__', '.')
 
             # New secondary relation query
-            query2 = self.query.copy()
+            query2 = source.copy()
+            query2.selects = []
+
+            # In selectin mode the main query wheres are not re-run for each relation.
+            # Instead the primary keys of the main results are added as an IN list
+            # when the query is executed (see _fetch_orm_queries)
+            if selectin:
+                query2.wheres = []
+                query2.or_wheres = []
+                query2.limit = None
+                query2.offset = None
 
             # Build ORM Relations but force HasMany joins to INNER JOIN
             self._build_orm_relations(query2)
@@ -390,7 +792,7 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
 
             # Set selects to only those in the related table
             table = self._get_join_table(query2, alias=relation.name)
-            columns = relation.entity.selectable_columns(table, show_writeonly=self.query.show_writeonly)
+            columns = relation.entity.selectable_columns(table, show_writeonly=source.show_writeonly, fields=projection.get(relation.name))
             for column in columns:
                 query2.selects.append(column.label(quoted_name(relation.name + '__' + column.name, True)))
 
@@ -399,7 +801,7 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
                 if relation.name + '__' not in sub_relation.name: continue
                 if sub_relation.contains_many(query2.relations, skip=relation.name.split('__')): continue
                 table = self._get_join_table(query2, alias=sub_relation.name)
-                columns = sub_relation.entity.selectable_columns(table, show_writeonly=self.query.show_writeonly)
+                columns = sub_relation.entity.selectable_columns(table, show_writeonly=source.show_writeonly, fields=projection.get(sub_relation.name))
                 for column in columns:
                     query2.selects.append(column.label(quoted_name(sub_relation.name + '__' + column.name, True)))
 
@@ -443,18 +845,59 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
             query2.sort = new_sorts
             query2.order_by = query2.sort
 
+            # Wheres on any other *Many relations become EXISTS semi-joins
+            # so only this relations rows are returned
+            self._build_orm_semijoins(query2, source, grain=relation.name)
+
             # Build secondary relation query
             query2, saquery2 = self._build_query(method, query2)
             queries.append({
                 'name': relation.name,
                 'query': query2,
                 'saquery': saquery2,
-                'sql': str(saquery2),
+                'selectin': selectin,
             })
 
         # Return all queries
         return queries
 
+    def _projection(self, query: Query, selects: List) -> Dict[str, List[str]]:
+        """Model fields of a partial .select() by relation name, or 'primary' for the main model"""
+        if not selects: return {}
+
+        # Primary keys are always selected
+        projection = {'primary': [self.entity.pk]}
+        for select in selects:
+            parts = select.split('.')
+            name = '__'.join(parts[0:-1]) or 'primary'
+            entity = self.entity
+            if name != 'primary':
+                if name not in query.relations: raise Exception('Select {} is not an included relation'.format(select))
+                entity = query.relations[name].entity
+                if name not in projection: projection[name] = [entity.pk]
+
+            # Raises exception if the field does not exist
+            entity.modelfield(parts[-1])
+            projection[name].append(parts[-1])
+
+        # Fields needed to key and paginate the main results
+        if query.keyed_by: projection['primary'].append(query.keyed_by)
+        if query.keyset: projection['primary'].extend([x[0] for x in self._keyset_order(query)])
+
+        # Fields needed to merge *Many relations into their parents
+        for name, fields in projection.items():
+            if name == 'primary': continue
+            relation = query.relations[name]
+            if relation.is_type(HasMany, MorphMany): fields.append(relation.foreign_key)
+            for key in ('dict_key', 'list_value'):
+                if getvalue(relation, key): fields.append(getvalue(relation, key))
+            dict_value = getvalue(relation, 'dict_value')
+            if type(dict_value) == list: fields.extend(dict_value)
+            elif dict_value: fields.append(dict_value)
+
+        # Deduplicate but keep order
+        return {name: list(dict.fromkeys(fields)) for name, fields in projection.items()}
+
     def _build_orm_relations(self, query: Query) -> None:
         if not query.includes: return
 
@@ -516,10 +959,11 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
 
                 # Add relation to List only once
                 if relation_name not in relations:
-                    # We have to deepcopy a relationship becuase if we have owner and creator
+                    # We have to copy a relationship becuase if we have owner and creator
                     # and both of those user models have a "Contact" model, that contact model is a
-                    # single instance.  We want separate instances of each relationship
-                    relations[relation_name] = deepcopy(relation)
+                    # single instance.  We want separate instances of each relationship.  A shallow
+                    # copy is enough as only the name differs, the entity and tables are shared.
+                    relations[relation_name] = copy(relation)
 
                     # Alias the Joined Table (so we can join the same table multiple times if needed, like owner and creator)
                     # Alias is always the relation_name, we'll just make it doubly clear with its own variable
@@ -661,320 +1105,171 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         # Set query.relations
         query.relations = relations
 
+    async def _build_orm_results_offloaded(self, query: Query, primary: List, secondary: Dict = {}) -> List[E]:
+        """Build ORM results on the event loop, or in a worker thread if offloaded"""
+        rows = len(primary) + sum([len(x) for x in secondary.values()])
+        if not self._offload(rows): return self._build_orm_results(query, primary, secondary)
+
+        # The worker runs in a copy of this context so the identity map is still shared
+        return await run_in_threadpool(self._build_orm_results, query, primary, secondary)
+
     def _build_orm_results(self, query: Query, primary: List, secondary: Dict = {}) -> List[E]:
         # No primary results, return empty List
         if not primary: return []
 
-        self.log.nl().header('Relations')
-        self.log.dump(query.relations)
+        # Skip all diagnostics if the uvicore.orm logger will not output them
+        debug = self.log.enabled()
+
+        if debug:
+            self.log.nl().header('Relations')
+            self.log.dump(query.relations)
+
+            self.log.nl().header('Primary Results')
+            self.log.dump(primary)
 
-        self.log.nl().header('Primary Results')
-        self.log.dump(primary)
+            self.log.nl().header('Has Many Data')
+            self.log.dump(secondary)
 
-        self.log.nl().header('Has Many Data')
-        self.log.dump(secondary)
+        # Include plan of how each result set fills its *One relations and how each
+        # *Many relation merges into its parents.  Built once per (cached) query.
+        if query.include_plan is None: query.include_plan = self._build_include_plan(query)
+        plan = query.include_plan
 
-        # Deepcopy relations Dict so I can remove relations I have already processed.
-        # I process all secondary results first.  This means all left over relations are of
-        # the primary results
-        relations = deepcopy(query.relations)
+        if debug:
+            self.log.nl().header('Include Plan')
+            self.log.dump(plan)
 
-        # Dictionary of all secondary converted models
+        # Dictionary of all secondary converted models by relation name, each a Dict keyed by PK
         models = {}
 
         # Dictionary of all *One models as a cache to deduplicate class instantiation
         singles = {}
 
-        # Full any *One relations method
-        def fill_one_relations(rel_name: str, data: List):
-            """Fill only the *One relations (One-To-One, One-To-Many)"""
-            self.log.nl().header('Filling *One Relations for ' + rel_name)
+        # Model fields of a partial .select() by relation name
+        projection = self._projection(query, self.query.selects)
 
-            # Skip if no data
-            if not data:
-                #models[rel_name] = {}
-                return
-
-            # Determin if data is primary or secondary
-            primary = (rel_name == 'primary')
-
-            # Split rel_name into __ parts
-            rel_name_parts = rel_name.split('__')
-
-            # Get the actual field, relation and entity for this relation rel_name
-            entity = self.entity
-            if not primary:
-                for rnpart in rel_name_parts:
-                    field: Field = entity.modelfield(rnpart)
-                    entity = field.relation.fill(field).entity
+        # Build models without validation, rows come straight from our own database
+        trusted = self._trusted()
 
-            #self.log.item('Field: ' + str(field))
-            self.log.item('Entity: ' + str(entity))
-            self.log.item('Data Keys: ' + str(data[0].keys()))
+        # Only plain queries share identity map instances.  Relations are set on the models
+        # of this query, and filters or write only columns make them differ from a plain load.
+        shared = not (self.query.includes or self.query.filters or self.query.or_filters or self.query.show_writeonly)
 
-            # Add a new List to our Dict of models
-            models[rel_name] = {}
-
-            # Pk field and column
-            pk = entity.pk
-            pk_column = entity.mapper(pk).column()
-            if not primary: pk_column = rel_name + '__' + pk_column
-
-            # Track completed relations so I can remove from our relations list later
-            completed_relations = {}
-
-            # Loop each row of raw data
-            i = 0
+        # Fill in all *One relations for all secondary results first, then the primary results
+        for rel_name, data in list(secondary.items()) + [('primary', primary)]:
+            # Skip if no data
+            if not data: continue
+            dataset = plan['datasets'].get(rel_name)
+            if dataset is None: continue
+            if debug: self.log.nl().header('Filling *One Relations for ' + rel_name)
+
+            # Row to model hydrators compiled once for all rows of this data
+            hydrate = hydrator(dataset['entity'], data[0], dataset['prefix'], only=projection.get(rel_name), trusted=trusted)
+            hydrators = {}
+            for one in dataset['ones']:
+                if one['tablename'] not in singles: singles[one['tablename']] = {}
+
+            # Because of Many-To-Many we could have the same model multiple times.  But we only want
+            # to convert and deal with it once based on unique PK
+            pk_value = dataset['pk']
+            results = {}
             for row in data:
-
-                # Because of Many-To-Many we could have the same model multiple times.  But we only want
-                # to convert and deal with it once based on unique PK
-                if getattr(row, pk_column) in models[rel_name]: continue
-                #if models[rel_name][getattr(row, pk_column)]: continue
-
-                # Convert this one row to model (just the main fields, not relations)
-                if primary:
-                    root_model = entity.mapper(row).model()
-                    #root_model = entity.mapper(row).row_to_model()
-                else:
-                    root_model = entity.mapper(row, rel_name).model()
-                    #root_model = entity.mapper(row, rel_name).row_to_model()
-
-                # Get pk value
-                pk_value = getattr(root_model, pk)
-
-                # Loop only *One relations that apply to this one "data" model
-                relation: Relation
-                for relation in relations.values():
-
-                    # Only look at relations that begin with this relation__ and are *One
-                    if not primary and rel_name + '__' not in relation.name: continue
-
-                    # Walk up relations and exclude if ANY relation is a *Many starting from rel_name and up
-                    if relation.contains_many(query.relations, skip=rel_name_parts): continue
-
-                    # Log output
-                    if i == 0: self.log.item('Relation: ' + relation.name + ' - ' + str(relation))
-
-                    # RowProxy results lookup prefix
-                    prefix = relation.name
-
-                    # Get all relation fieldnames from relation.name split
-                    fieldnames = relation.name.split('__')
-                    if not primary:
-                        # Skip the first __ parts of rel_name
-                        fieldnames = fieldnames[len(rel_name_parts):]
-                    if i == 0: self.log.item2('  Fieldnames: ' + ', '.join(fieldnames))
-
-                    # Walk down the root model by fieldnames until you reach the nested
-                    # model that has the right field to hold this converted sub model
-                    # Remember each relation has the full__nested__name so always start with the
-                    # root_model for each relation and work your way down.
+                if pk_value(row) in results: continue
+
+                # Convert this one row to model (just the main fields, not relations).
+                # With an active identity map a plain query reuses the already loaded instance.
+                root_model = hydrate.load(row, shared)
+
+                # Fill each *One relation of this row, only converting each unique *One record
+                # just once.  Other rows, and other relations of the same table, pull from the singles cache.
+                for one in dataset['ones']:
+                    sub_model_pk_value = one['pk'](row)
+                    if sub_model_pk_value is None: continue
+                    cache = singles[one['tablename']]
+                    sub_model = cache.get(sub_model_pk_value)
+                    if sub_model is None:
+                        prefix = one['prefix']
+                        if prefix not in hydrators:
+                            hydrators[prefix] = hydrator(one['entity'], row, prefix, only=projection.get(prefix), trusted=trusted)
+                        sub_model = cache[sub_model_pk_value] = hydrators[prefix].load(row, shared)
+
+                    # Walk down the root model to the nested model that holds this sub model
                     model = root_model
-                    for f in range(0, len(fieldnames) - 1):
-                        model = getattr(model, fieldnames[f])
-
-                    # Actual fieldname is always the LAST of the fieldnames, but our model was walked down.
-                    fieldname = fieldnames[-1] if fieldnames else relation.name
-
-                    # Walkdown Log
-                    if i == 0: self.log.item2('  Model Field: ' + fieldname)
-                    if i == 0: self.log.item2('  Field Model: ' + str(model.__class__))
-
-                    # Convert this one rows relation data into a sub_relation model
-                    # Only convert each unique *One record just once, or else pull from singles cache
-                    # The odd part about this cache is if you include many nested relations one one parent model
-                    # And a child model also uses the same child, it too will include all nested relations
-                    # Example if you do .include('creator.info', 'owner').  If owner is id=1 and id=1 was already
-                    # a creator, that owner will also have the nested INFO filled out, because it pulls from the cache.
-                    if relation.entity.tablename not in singles: singles[relation.entity.tablename] = {}
-                    sub_model_pk = relation.name + '__' + relation.entity.mapper(relation.entity.pk).column()
-                    sub_model_pk_value = getattr(row, sub_model_pk)
-                    if sub_model_pk_value is not None and sub_model_pk_value not in singles[relation.entity.tablename]:
-                        singles[relation.entity.tablename][sub_model_pk_value] = relation.entity.mapper(row, prefix).model()
-                        #singles[relation.entity.tablename][sub_model_pk_value] = relation.entity.mapper(row, prefix).row_to_model()
-
-                    # Get sub_model from singles cache
-                    if sub_model_pk_value is not None:
-                        sub_model = singles[relation.entity.tablename][sub_model_pk_value]
-                        #sub_model = relation.entity.mapper(row, prefix).model(False) # No cache version
-
-                        # Add this converted sub_model to the walked down parent model
-                        setattr(model, fieldname, sub_model)
-
-                    # Mark relation as complete so I can delete from relations Dict later
-                    completed_relations[relation.name] = 1
-
-                # All *One relations have been converted and merged
-                # Add this fully converted (including nested *One relations) model to List of models
-                models[rel_name][pk_value] = root_model
-                i += 1
-
-            # Delete all completed relations from our relation deepcopy.  We will not need them again
-            for completed_relation in completed_relations.keys():
-                del relations[completed_relation]
-
-        # Fill in all *One relations for all secondary results first.
-        # as each relation is merged it will be removed from our local relations deepcopy.
-        # All relations left will be those on the main results data.
-        for rel_name, rel_data in secondary.items():
-            fill_one_relations(rel_name, rel_data)
-        #fill_one_relations(secondary['comments'], 'comments')
-
-        # Fill in all *One relations for the primary results.
-        fill_one_relations('primary', primary)
-
-        # All relations left should be of *Many either for the primary results
-        # or for any of the secondary results
-        self.log.nl().header('Leftover Relations are *Many')
-        self.log.dump(relations)
-
-        # All records in models Dict are *Many and the main Primary dataset
-        # All remaining relations are the *Many which should match the models Dict key
-        # Looping the *Many relations in REVERSE gives us the deepest relations first which is critical
-        self.log.nl().header('Combining Recursive *Many Models')
-
-        relation: Relation
-        for relation in reversed(relations.values()):
-
-            # Relation name parts
-            relation_parts = relation.name.split('__')
-            field = relation_parts[-1]
-
+                    for fieldname in one['walk']:
+                        model = getattr(model, fieldname)
+                        if model is None: break
+                    if model is not None: setattr(model, one['field'], sub_model)
+
+                results[getattr(root_model, dataset['entity'].pk)] = root_model
+            models[rel_name] = results
+
+        # Merge each *Many relation into its parents.  Deepest relations first which is critical.
+        # Children are grouped by parent key in one pass, then set on each parent.
+        if debug: self.log.nl().header('Combining Recursive *Many Models')
+        for many in plan['manys']:
             # If models does not contain this relation, skip the merge
-            if relation.name not in models: continue
-
-            # Get parent and child Dict of models
-            children_name = relation.name
-            children = models[relation.name]
-            parents_name = 'primary'
-            if len(relation_parts) > 1: parents_name = '__'.join(relation_parts[:-1])
-            if parents_name in models:
+            if many['name'] not in models: continue
+            children = models[many['name']]
+            if many['parents'] in models:
                 # Parent is a *Many so grab from models
-                parents = models[parents_name]
+                parents = models[many['parents']]
             else:
-                # Parent is a *One, so grap from singles cache
-                parents = singles[query.relations.get(parents_name).entity.tablename]
-
-            self.log.item('Combining child: ' + children_name + ' into parent: ' + parents_name)
-
-            # Determine if child *Many results should be displayed as a Dict or List
-            dict_key = getvalue(relation, 'dict_key')
-            dict_value = getvalue(relation, 'dict_value')
-            list_value = getvalue(relation, 'list_value')
-
-            # Loop parents so we can at least set each child to empty [] instead of None.  We always want [] instead of None for empty children
-            for parent in parents.values():
-                # Set empty [] or {}
-                if dict_key:
-                    setattr(parent, field, {})
-                else:
-                    setattr(parent, field, [])
-
-            # Merge in Many-To-Many by using the original RowProxy result which contains
-            # The pivot tables joining column (left_key)
-            if type(relation) == BelongsToMany or type(relation) == MorphToMany:
-                left_key = relation.name + '__' + relation.left_key
-                right_key = relation.name + '__' + relation.entity.mapper(relation.entity.pk).column()
-
-                # QUESTION, what is the differente from children.values() vs
-                # secondary?  Look at the ELSE below that for child in children.values()
-                # but this many* uses secondary?
-                # Can I combine all relations into one large loop?
-                # Because I am doing identical work in the dict_key stuff
-
-                # ALSO all of this dict_key code may not work anyway
-                # I bet the API will not know how to handle input and complain?
-                # I may have to handle specially in the ModelRouter
-
-                # Loop raw RowProxy to find proper pivot keys
-                for row in secondary[relation.name]:
-                    left_id = getattr(row, left_key)
-                    right_id = getattr(row, right_key)
-
-                    # Get parent value, the value of the main table
-                    parent = parents[left_id]
-
-                    # Get child value. The value of the many record
-                    child = children[right_id]
-
-                    # Set None field to empty List
-                    if getattr(parent, field) is None:
-                        setattr(parent, field, [])
-
-                    # Add each *Many model as a Dict
-                    if dict_key:
-                        if dict_value:
-                            if type(dict_value) == list:
-                                value = {key:getattr(child, key) for key in dict_value}
-                            else:
-                                value = getattr(child, dict_value)
-                        else:
-                            value = child.dict()
-                        getattr(parent, field)[getattr(child, dict_key)] = value
-
-
-                    # Add each *Many model as a List of a single value
-                    elif list_value:
-                        getattr(parent, field).append(getattr(child, list_value))
-
-                    # Add each *Many as a List of the actual Models
-                    else:
-                        # Append to list using deepcopy
-                        getattr(parent, field).append(
-                            # We must deep copy the record becuase we dedup the *Many
-                            # but they could be used multiple times
-                            # ?? Hum maybe not, good if you change one it changes them all
-                            # But all the *One will NOT be like this I don't believe, have to test
-                            #deepcopy(child[right_id])
-                            child
-                        )
-
+                # Parent is a *One, so grab from singles cache
+                parents = singles.get(many['parents_tablename'], {})
+            if debug: self.log.item('Combining child: ' + many['name'] + ' into parent: ' + many['parents'])
+
+            groups = {}
+            if many['pivot']:
+                # Merge in Many-To-Many by using the original RowProxy result which contains
+                # the pivot tables joining column (left_key).  The same child can have many parents.
+                left_key = many['left_key']
+                right_key = many['right_key']
+                for row in secondary[many['name']]:
+                    child = children.get(right_key(row))
+                    if child is None: continue
+                    parent_pk_value = left_key(row)
+                    if parent_pk_value not in groups: groups[parent_pk_value] = []
+                    groups[parent_pk_value].append(child)
             else:
-
+                foreign_key = many['foreign_key']
                 for child in children.values():
-                    parent_pk_value = getattr(child, relation.foreign_key)
-                    if parent_pk_value not in parents: continue;
-
-                    parent = parents[parent_pk_value]
-                    field = relation_parts[-1]
-
-                    # # Set None field to empty list
-                    # if getattr(parent, field) is None:
-                    #     setattr(parent, field, [])
-
-                    # DUPLCATING work here, see above for nearly exact same thing
-                    # need to optimize this code
-
+                    parent_pk_value = foreign_key(child)
+                    if parent_pk_value not in groups: groups[parent_pk_value] = []
+                    groups[parent_pk_value].append(child)
+
+            # Set each parents children.  We always want [] or {} instead of None for empty children
+            field = many['field']
+            dict_key = many['dict_key']
+            dict_value = many['dict_value']
+            list_value = many['list_value']
+            for (parent_pk_value, parent) in parents.items():
+                group = groups.get(parent_pk_value, [])
+                if dict_key:
                     # Add each *Many model as a Dict
-                    if dict_key:
-                        if dict_value:
-                            if type(dict_value) == list:
-                                # Dict value is a list.  Create a dictionary from the lists keys
-                                value = {key:getattr(child, key) for key in dict_value}
-                            else:
-                                # Dict value is a string, use just that fields value
-                                value = getattr(child, dict_value)
-                        else:
-                            # No dict value set, but there is a dict_key, so we want a dict.  Use the entire record as a dict
-                            value = child.dict()
-                        getattr(parent, field)[getattr(child, dict_key)] = value
-                        #setattr(parent, field, 'x')
-
-                    # Add each *Many model as a List of a single value
-                    elif list_value:
-                        getattr(parent, field).append(getattr(child, list_value))
-
-                    # Add each *Many as a List of the actual Models
+                    if not dict_value:
+                        # No dict value set, use the entire record as a dict
+                        value = {getattr(child, dict_key): child.dict() for child in group}
+                    elif type(dict_value) == list:
+                        # Dict value is a list.  Create a dictionary from the lists keys
+                        value = {getattr(child, dict_key): {key:getattr(child, key) for key in dict_value} for child in group}
                     else:
-                        getattr(parent, field).append(child)
-
+                        # Dict value is a string, use just that fields value
+                        value = {getattr(child, dict_key): getattr(child, dict_value) for child in group}
+                elif list_value:
+                    # Add each *Many model as a List of a single value
+                    value = [getattr(child, list_value) for child in group]
+                else:
+                    # Add each *Many as a List of the actual Models.  Not copied, the same child
+                    # is shared by all of its Many-To-Many parents
+                    value = group
+                setattr(parent, field, value)
 
-        self.log.nl().header('Singles Cache')
-        self.log.dump(singles)
+        if debug:
+            self.log.nl().header('Singles Cache')
+            self.log.dump(singles)
 
-        self.log.nl().header('Secondary *Many Models')
-        self.log.dump(models)
+            self.log.nl().header('Secondary *Many Models')
+            self.log.dump(models)
 
         # These models are already a Dict keyed by PK
         # Return existing primary model if user wanted keyby id
@@ -993,6 +1288,76 @@ class OrmQueryBuilder(Generic[B, E], QueryBuilder[B, E], BuilderInterface[B, E])
         # No keyby, convert primary models to a List
         return [x for x in models['primary'].values()]
 
+    def _build_include_plan(self, query: Query) -> Dict:
+        """Precompute how results of this query fill their *One relations and merge their *Many relations"""
+        relations = query.relations
+
+        # Each result set is the primary results, or the results of one *Many relation query.
+        # Secondary results are filled first so each *One relation is claimed by the deepest *Many above it.
+        datasets = ODict()
+        names = [name for (name, relation) in relations.items() if relation.is_many()] + ['primary']
+        claimed = {}
+        for rel_name in names:
+            primary = (rel_name == 'primary')
+            rel_name_parts = rel_name.split('__')
+            entity = self.entity if primary else relations[rel_name].entity
+            pk_column = entity.mapper(entity.pk).column()
+            if not primary: pk_column = rel_name + '__' + pk_column
+
+            ones = []
+            for relation in relations.values():
+                if relation.name in claimed or relation.is_many(): continue
+
+                # Only relations below this *Many relation, and without another *Many in between
+                if not primary and not relation.name.startswith(rel_name + '__'): continue
+                if relation.contains_many(relations, skip=rel_name_parts): continue
+                claimed[relation.name] = True
+
+                # Walk down the root model by fieldnames to the nested model that holds this relation
+                fieldnames = relation.name.split('__')
+                if not primary: fieldnames = fieldnames[len(rel_name_parts):]
+                sub_pk_column = relation.name + '__' + relation.entity.mapper(relation.entity.pk).column()
+                ones.append({
+                    'name': relation.name,
+                    'prefix': relation.name,
+                    'entity': relation.entity,
+                    'tablename': relation.entity.tablename,
+                    'walk': fieldnames[0:-1],
+                    'field': fieldnames[-1],
+                    'pk': operators.attrgetter(sub_pk_column),
+                })
+
+            datasets[rel_name] = {
+                'entity': entity,
+                'prefix': None if primary else rel_name,
+                'pk': operators.attrgetter(pk_column),
+                'ones': ones,
+            }
+
+        # Each *Many relation merged into its parent, deepest first
+        manys = []
+        for relation in reversed(relations.values()):
+            if not relation.is_many(): continue
+            relation_parts = relation.name.split('__')
+            parents = '__'.join(relation_parts[0:-1]) or 'primary'
+            pivot = relation.is_type(BelongsToMany, MorphToMany)
+            right_key = relation.name + '__' + relation.entity.mapper(relation.entity.pk).column()
+            manys.append({
+                'name': relation.name,
+                'field': relation_parts[-1],
+                'parents': parents,
+                'parents_tablename': relations[parents].entity.tablename if parents in relations else None,
+                'pivot': pivot,
+                'left_key': operators.attrgetter(relation.name + '__' + relation.left_key) if pivot else None,
+                'right_key': operators.attrgetter(right_key) if pivot else None,
+                'foreign_key': None if pivot else operators.attrgetter(relation.foreign_key),
+                'dict_key': getvalue(relation, 'dict_key'),
+                'dict_value': getvalue(relation, 'dict_value'),
+                'list_value': getvalue(relation, 'list_value'),
+            })
+
+        return {'datasets': datasets, 'manys': manys}
+
     def _connection(self):
         return self.entity.connection
 